@@ -0,0 +1,48 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+
+def use_database_copy() -> Path:
+    """Point the app data dir to a temporary copy of the user's database.
+
+    Must run before the first query, since the engines are bound to the
+    database path when they are created.
+    """
+
+    from word_seek.db.config import get_db_path
+
+    source = Path(get_db_path())
+    if not source.exists():
+        sys.exit(f"No database at {source}. Import dictionaries first.")
+
+    data_home = Path(tempfile.mkdtemp(prefix="word-seek-bench-"))
+    os.environ["XDG_DATA_HOME"] = str(data_home)
+    target = Path(get_db_path())
+    target.parent.mkdir(parents=True)
+    shutil.copyfile(source, target)
+    return target
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(name: str, samples: Sequence[float]) -> None:
+    mean = sum(samples) / len(samples)
+    print(
+        f"{name:<28} n={len(samples):<6} mean={mean * 1000:8.3f}ms "
+        f"p50={percentile(samples, 50) * 1000:8.3f}ms "
+        f"p95={percentile(samples, 95) * 1000:8.3f}ms"
+    )
+
+
+def timed[T](func: Callable[[], T]) -> tuple[float, T]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
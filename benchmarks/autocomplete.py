@@ -0,0 +1,79 @@
+"""Autocomplete while typing: words are typed a letter per interval, and each
+prefix is sent as a query. Reports the delay from the last letter to its
+suggestions and how many queries were wasted on older prefixes.
+
+python -m benchmarks.autocomplete [WORDS] [INTERVAL_MS]
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+from reactivex import Subject
+
+from ._env import report, use_database_copy
+
+use_database_copy()
+
+from word_seek.db import repo  # noqa: E402
+from word_seek.eventsrc import autocomplete  # noqa: E402
+from word_seek.eventsrc.autocomplete import (  # noqa: E402
+    AutocompleteStats,
+    FoundPhrases,
+    PhrasesQuery,
+    create_autocomplete,
+)
+
+
+async def type_word(word: str, interval: float, debounce: float) -> float:
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    typed_at = 0.0
+
+    def on_next(found: FoundPhrases) -> None:
+        if found.query.phrase == word and not done.done():
+            done.set_result(time.perf_counter() - typed_at)
+
+    queries = Subject[PhrasesQuery]()
+    with create_autocomplete(queries, debounce).subscribe(on_next=on_next):
+        for end in range(1, len(word) + 1):
+            typed_at = time.perf_counter()
+            queries.on_next(PhrasesQuery(word[:end]))
+            await asyncio.sleep(interval)
+        return await done
+
+
+async def measure(words: list[str], interval: float, debounce: float) -> None:
+    autocomplete.stats = AutocompleteStats()
+    autocomplete.cache.hits = autocomplete.cache.misses = 0
+    samples = list[float]()
+    for word in words:
+        autocomplete.cache.clear()
+        samples.append(await type_word(word, interval, debounce))
+
+    stats = autocomplete.stats
+    report(f"debounce={debounce * 1000:.0f}ms", samples)
+    print(
+        f"{'':<28} queries={stats.started} completed={stats.completed} "
+        f"wasted={stats.wasted} (cancelled={stats.cancelled}, "
+        f"superseded={stats.superseded}) narrowed={stats.narrowed}"
+    )
+    cache = autocomplete.cache.stats()
+    print(f"{'':<28} cache hits={cache.hits} misses={cache.misses}")
+
+
+async def main(count: int, interval: float) -> None:
+    random.seed(0)
+    texts = [text for text in await repo.list_phrase_texts() if len(text) >= 8]
+    words = random.sample(texts, count)
+    await measure(words[:3], interval, 0.0)
+
+    await measure(words, interval, 0.0)
+    await measure(words, interval, interval * 1.5)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    interval = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.03
+    asyncio.run(main(count, interval))
@@ -0,0 +1,89 @@
+"""CLI runs with and without the daemon: wall time of whole `lookup` and
+`suggest` processes, and the latency of requests on one open connection, as an
+editor plugin would keep it.
+
+python -m benchmarks.daemon [RUNS] [REQUESTS]
+"""
+
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+
+from ._env import report, use_database_copy
+
+db_path = use_database_copy()
+
+from word_seek.daemon.client import DaemonUnavailable, call  # noqa: E402
+from word_seek.daemon.protocol import encode, recv_message  # noqa: E402
+from word_seek.db.config import get_socket_path  # noqa: E402
+
+CLI = [sys.executable, "-m", "word_seek"]
+
+
+def run_cli(words: list[str], runs: int) -> None:
+    for name, args in [
+        ("lookup", ["lookup", "--output", "plain"]),
+        ("suggest", ["suggest"]),
+    ]:
+        samples = list[float]()
+        for word in words[:runs]:
+            start = time.perf_counter()
+            subprocess.run([*CLI, *args, word], capture_output=True, check=False)
+            samples.append(time.perf_counter() - start)
+        report(f"process {name}", samples)
+
+
+def run_connection(words: list[str], count: int) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(get_socket_path()))
+        for name, request in [
+            ("ping", lambda word: {"op": "ping"}),
+            ("lookup", lambda word: {"op": "lookup", "phrase": word, "output": "json"}),
+            ("suggest", lambda word: {"op": "suggest", "phrase": word, "limit": 20}),
+        ]:
+            samples = list[float]()
+            for word in words[:count]:
+                start = time.perf_counter()
+                sock.sendall(encode(request(word)))
+                recv_message(sock)
+                samples.append(time.perf_counter() - start)
+            report(f"connection {name}", samples)
+
+
+def wait_for_daemon(daemon: subprocess.Popen[bytes]) -> None:
+    while daemon.poll() is None:
+        try:
+            call({"op": "ping"})
+            return
+        except DaemonUnavailable:
+            time.sleep(0.05)
+    sys.exit("The daemon did not start")
+
+
+def main(runs: int, count: int) -> None:
+    random.seed(0)
+    with sqlite3.connect(db_path) as conn:
+        texts = [text for (text,) in conn.execute("SELECT text FROM phrase")]
+    words = random.sample(texts, max(runs, count))
+
+    print("in-process")
+    run_cli(words, runs)
+
+    daemon = subprocess.Popen([*CLI, "daemon"])
+    try:
+        wait_for_daemon(daemon)
+        print("daemon")
+        run_cli(words, runs)
+        run_connection(words, count)
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    main(runs, count)
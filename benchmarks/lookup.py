@@ -0,0 +1,64 @@
+"""End-to-end lookup latency: three repo calls versus one ``repo.lookup``, with
+the article cache cold and warm.
+
+python -m benchmarks.lookup [ROUNDS]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+
+from ._env import report, use_database_copy
+
+use_database_copy()
+
+from word_seek.db import cache, repo  # noqa: E402
+from word_seek.db.models import ViewLog  # noqa: E402
+
+
+async def separate_calls(term: str) -> None:
+    phrases = await repo.find_phrases(term, limit=1)
+    if phrases:
+        await repo.find_articles(phrases[0])
+        time = datetime.now(timezone.utc)
+        await repo.update_view_log(ViewLog(phrase_id=phrases[0].id, shown_at_utc=time))
+
+
+async def single_lookup(term: str) -> None:
+    await repo.lookup(term)
+
+
+async def cold_lookup(term: str) -> None:
+    cache.articles.clear()
+    await repo.lookup(term)
+
+
+async def measure(
+    func: Callable[[str], Awaitable[None]], terms: list[str]
+) -> list[float]:
+    samples = list[float]()
+    for term in terms:
+        start = time.perf_counter()
+        await func(term)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def main(rounds: int) -> None:
+    random.seed(0)
+    terms = random.sample(await repo.list_phrase_texts(), rounds)
+    await measure(single_lookup, terms[:10])
+
+    cache.articles.clear()
+    report("find+articles+log", await measure(separate_calls, terms))
+    report("repo.lookup", await measure(cold_lookup, terms))
+    await measure(single_lookup, terms)
+    report("repo.lookup (cached)", await measure(single_lookup, terms))
+    print(cache.articles.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,109 @@
+"""Hot reads through the ORM versus the raw read path: latency per call and
+memory blocks still allocated for the returned rows, each call in a new session
+as the repo does.
+
+python -m benchmarks.reads [ROUNDS]
+"""
+
+import asyncio
+import gc
+import random
+import sys
+import time
+from collections.abc import Awaitable, Callable, Sized
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ._env import report, use_database_copy
+
+use_database_copy()
+
+from word_seek.db import exec, queries, reads, repo  # noqa: E402
+from word_seek.db.models import Phrase, ViewLog  # noqa: E402
+
+type Read = Callable[[AsyncSession, Phrase], Awaitable[Sized]]
+
+PAGE = 50
+
+
+async def orm_phrases(session: AsyncSession, phrase: Phrase) -> Sized:
+    return await exec.scalars_list(session, queries.find_phrase(phrase.text[:2], PAGE))
+
+
+async def raw_phrases(session: AsyncSession, phrase: Phrase) -> Sized:
+    return await reads.find_phrases(session, phrase.text[:2], PAGE)
+
+
+async def orm_articles(session: AsyncSession, phrase: Phrase) -> Sized:
+    return await exec.scalars_list(session, queries.find_articles(phrase))
+
+
+async def raw_articles(session: AsyncSession, phrase: Phrase) -> Sized:
+    return await reads.find_articles(session, phrase.id)
+
+
+async def orm_view_logs(session: AsyncSession, phrase: Phrase) -> Sized:
+    return await exec.scalars_list(session, queries.list_view_logs(PAGE))
+
+
+async def raw_view_logs(session: AsyncSession, phrase: Phrase) -> Sized:
+    return await reads.list_view_logs(session, PAGE)
+
+
+async def call(read: Read, phrase: Phrase) -> Sized:
+    async with exec.new_session() as session:
+        return await read(session, phrase)
+
+
+async def measure(name: str, read: Read, phrases: list[Phrase]) -> None:
+    for phrase in phrases[:20]:
+        await call(read, phrase)
+
+    samples = list[float]()
+    for phrase in phrases:
+        start = time.perf_counter()
+        await call(read, phrase)
+        samples.append(time.perf_counter() - start)
+    report(name, samples)
+
+    blocks, rows = 0, 0
+    for phrase in phrases:
+        gc.collect()
+        before = sys.getallocatedblocks()
+        result = await call(read, phrase)
+        gc.collect()
+        blocks += sys.getallocatedblocks() - before
+        rows += len(result)
+        del result
+    print(
+        f"{'':<28} rows/call={rows / len(phrases):.1f} blocks/row={blocks / rows:.1f}"
+    )
+
+
+async def main(rounds: int) -> None:
+    random.seed(0)
+    async with exec.new_session() as session:
+        ids = list(await session.scalars(select(Phrase.id)))
+        query = select(Phrase).where(Phrase.id.in_(random.sample(ids, rounds)))
+        phrases = list(await session.scalars(query))
+
+    # the copy gets a page of history to list
+    for phrase in phrases[:PAGE]:
+        log = ViewLog(phrase_id=phrase.id, shown_at_utc=datetime.now(timezone.utc))
+        await repo.update_view_log(log)
+
+    for name, read in [
+        ("orm find_phrases", orm_phrases),
+        ("raw find_phrases", raw_phrases),
+        ("orm find_articles", orm_articles),
+        ("raw find_articles", raw_articles),
+        ("orm list_view_logs", orm_view_logs),
+        ("raw list_view_logs", raw_view_logs),
+    ]:
+        await measure(name, read, phrases)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
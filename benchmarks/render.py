@@ -0,0 +1,70 @@
+"""XDXF rendering cost: parsing the markup versus replaying compiled tokens.
+
+python -m benchmarks.render [ARTICLES]
+"""
+
+import asyncio
+import sys
+from itertools import islice
+
+from sqlalchemy import select
+
+from ._env import report, timed, use_database_copy
+
+use_database_copy()
+
+from word_seek.cli.formats.xdxf import iter_xdxf_lines, render_xdxf_lines  # noqa: E402
+from word_seek.db.exec import new_session  # noqa: E402
+from word_seek.db.models import Article, ArticleFormat  # noqa: E402
+from word_seek.formats import tokens  # noqa: E402
+
+
+async def load_texts(limit: int) -> list[str]:
+    query = select(Article.text).where(Article.dtype == ArticleFormat.XDXF).limit(limit)
+    async with new_session() as session:
+        return list(await session.scalars(query))
+
+
+def main(limit: int) -> None:
+    texts = asyncio.run(load_texts(limit))
+    compile_samples, compiled = list[float](), list[str]()
+    for text in texts:
+        elapsed, stream = timed(lambda: tokens.dumps(tokens.compile_xdxf(text)))
+        compile_samples.append(elapsed)
+        compiled.append(stream)
+
+    report("compile (import)", compile_samples)
+    report(
+        "render from markup", [timed(lambda: render_xdxf_lines(t))[0] for t in texts]
+    )
+    report(
+        "render from tokens",
+        [timed(lambda: render_xdxf_lines(t, s))[0] for t, s in zip(texts, compiled)],
+    )
+    # a few long articles hold thousands of nodes
+    long = "\n".join(texts[:500])
+    report(
+        "compile long article",
+        [timed(lambda: tokens.compile_xdxf(long))[0] for _ in range(5)],
+    )
+    report(
+        "first screen, long",
+        [timed(lambda: list(islice(iter_xdxf_lines(long), 24)))[0] for _ in range(5)],
+    )
+    long_tokens = tokens.dumps(tokens.compile_xdxf(long))
+    report(
+        "first screen, long tokens",
+        [
+            timed(lambda: list(islice(iter_xdxf_lines(long, long_tokens), 24)))[0]
+            for _ in range(5)
+        ],
+    )
+    report(
+        "all lines, long", [timed(lambda: render_xdxf_lines(long))[0] for _ in range(5)]
+    )
+    size = sum(len(s.encode()) for s in compiled) / sum(len(t.encode()) for t in texts)
+    print(f"tokens/markup size: {size:.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
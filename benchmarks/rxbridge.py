@@ -0,0 +1,95 @@
+"""Rx to asyncio bridge: events/sec of an awaitable started per event, and
+the delay from a keystroke to its suggestions when the answer is cached, so
+the bridge rather than the search is measured.
+
+python -m benchmarks.rxbridge [EVENTS] [WORDS]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from functools import partial
+
+from reactivex import Observable, Subject
+from reactivex import operators as op
+
+from ._env import report, use_database_copy
+
+use_database_copy()
+
+from word_seek.db import repo  # noqa: E402
+from word_seek.eventsrc.autocomplete import (  # noqa: E402
+    FoundPhrases,
+    PhrasesQuery,
+    create_autocomplete,
+)
+from word_seek.rxutil import async_observable  # noqa: E402
+
+
+def rate(name: str, count: int, elapsed: float) -> None:
+    print(f"{name:<28} n={count:<6} {count / elapsed:12,.0f} events/s")
+
+
+async def switch_awaitables(count: int) -> None:
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+
+    async def work(item: int) -> int:
+        return item
+
+    def on_next(item: int) -> None:
+        if item == count - 1:
+            done.set_result(None)
+
+    def observe(item: int) -> Observable[int]:
+        return async_observable(partial(work, item), loop)
+
+    source = Subject[int]()
+    latest = source.pipe(op.map(observe), op.switch_latest())
+    with latest.subscribe(on_next=on_next):
+        start = time.perf_counter()
+        for item in range(count):
+            source.on_next(item)
+            await asyncio.sleep(0)
+        await done
+    rate("awaitable per event", count, time.perf_counter() - start)
+
+
+async def cached_keystrokes(words: list[str]) -> None:
+    loop = asyncio.get_running_loop()
+    queries = Subject[PhrasesQuery]()
+    received: asyncio.Future[None] = loop.create_future()
+    expected = ""
+
+    def on_next(found: FoundPhrases) -> None:
+        if found.query.phrase == expected and not received.done():
+            received.set_result(None)
+
+    samples = list[float]()
+    with create_autocomplete(queries).subscribe(on_next=on_next):
+        for measured in (False, True):
+            for word in words:
+                for end in range(1, len(word) + 1):
+                    expected = word[:end]
+                    received = loop.create_future()
+                    start = time.perf_counter()
+                    queries.on_next(PhrasesQuery(expected))
+                    await received
+                    if measured:
+                        samples.append(time.perf_counter() - start)
+    report("keystroke, cached", samples)
+
+
+async def main(count: int, words_count: int) -> None:
+    await switch_awaitables(count)
+
+    random.seed(0)
+    texts = [text for text in await repo.list_phrase_texts() if len(text) >= 8]
+    await cached_keystrokes(random.sample(texts, words_count))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    words_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(main(count, words_count))
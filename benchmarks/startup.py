@@ -0,0 +1,102 @@
+"""CLI import time per command, from ``python -X importtime``, checked against
+a budget. Exits with an error when a command goes over its budget or loads a
+module it should not need.
+
+python -m benchmarks.startup [RUNS]
+"""
+
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+
+MARKER = "startup-marker"
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+@dataclass(slots=True, frozen=True)
+class Command:
+    name: str
+    # attribute of word_seek.cli.commands, loaded as the command would
+    attr: str | None
+    budget_ms: float
+    forbidden: tuple[str, ...]
+
+
+COMMANDS = [
+    Command("app", None, 400, ("sqlalchemy", "alembic", "bs4", "reactivex")),
+    Command("dicts", "list_dicts", 900, ("alembic", "bs4", "reactivex")),
+    Command("history", "browse_history", 1000, ("alembic", "bs4")),
+    Command("wipeout", "wipeout_db", 450, ("sqlalchemy", "alembic", "bs4")),
+    Command("import-dir", "import_dir", 900, ("alembic", "bs4", "reactivex")),
+    Command("lookup", "lookup_phrase", 900, ("alembic", "bs4", "reactivex")),
+    Command(
+        "lookup-daemon", "lookup_remote", 400, ("sqlalchemy", "alembic", "reactivex")
+    ),
+    Command("search", "enter_search", 1100, ("alembic", "bs4")),
+    Command("annotate", "annotate_text", 900, ("alembic", "bs4", "reactivex")),
+]
+
+
+def profile(command: Command) -> tuple[float, dict[str, float]]:
+    """Import time of the command in ms, and the slowest top packages."""
+
+    code = f"import sys; sys.stderr.write('{MARKER}\\n'); import word_seek.cli.app"
+    if command.attr:
+        code += f"; from word_seek.cli.commands import {command.attr}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    _, _, log = result.stderr.partition(MARKER)
+
+    total, packages = 0.0, dict[str, float]()
+    for self_us, cumulative_us, indent, name in LINE.findall(log):
+        depth = len(indent) // 2
+        if depth == 0:
+            total += int(cumulative_us) / 1000
+        top = name.partition(".")[0]
+        if top != "word_seek":
+            packages[top] = packages.get(top, 0) + int(self_us) / 1000
+    return total, packages
+
+
+def loaded(command: Command) -> set[str]:
+    code = "import sys, word_seek.cli.app"
+    if command.attr:
+        code += f"; from word_seek.cli.commands import {command.attr}"
+    code += "; print(*{name.partition('.')[0] for name in sys.modules})"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(result.stdout.split())
+
+
+def main(runs: int) -> int:
+    failed = False
+    for command in COMMANDS:
+        samples, packages = list[float](), dict[str, float]()
+        for _ in range(runs):
+            total, packages = profile(command)
+            samples.append(total)
+        median = statistics.median(samples)
+        heaviest = sorted(packages.items(), key=lambda item: -item[1])[:4]
+        forbidden = sorted(loaded(command).intersection(command.forbidden))
+
+        ok = median <= command.budget_ms and not forbidden
+        failed = failed or not ok
+        print(
+            f"{command.name:<14} {median:7.1f}ms / {command.budget_ms:.0f}ms "
+            f"{'ok' if ok else 'FAIL'}  "
+            + " ".join(f"{name}={ms:.0f}" for name, ms in heaviest)
+        )
+        if forbidden:
+            print(f"{'':<14} loads {', '.join(forbidden)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
@@ -0,0 +1,114 @@
+"""Concurrent clients of the HTTP service: request latency and the overall rate
+of lookups, revalidated lookups and suggestions, each client keeping its
+connection open as a browser would. The service's own metrics follow.
+
+python -m benchmarks.web [CLIENTS] [REQUESTS]
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from urllib.parse import quote
+
+from ._env import report, use_database_copy
+
+db_path = use_database_copy()
+
+PORT = 8766
+CLI = [sys.executable, "-m", "word_seek", "serve-http", "--port", str(PORT)]
+
+
+async def get(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    target: str,
+    headers: dict[str, str],
+) -> tuple[int, dict[str, str], bytes]:
+    lines = [f"GET {target} HTTP/1.1", "Host: localhost"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    status_line, *header_lines = head.rstrip("\r\n").split("\r\n")
+    reply_headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        reply_headers[name.lower()] = value.strip()
+    size = int(reply_headers.get("content-length", "0"))
+    return int(status_line.split(" ")[1]), reply_headers, await reader.readexactly(size)
+
+
+async def run_client(
+    targets: list[str], headers: dict[str, str], samples: list[float]
+) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    try:
+        for target in targets:
+            start = time.perf_counter()
+            await get(reader, writer, target, headers)
+            samples.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_clients(
+    name: str, targets: list[str], clients: int, headers: dict[str, str]
+) -> None:
+    samples = list[float]()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(run_client(targets[i::clients], headers, samples) for i in range(clients))
+    )
+    elapsed = time.perf_counter() - start
+    report(name, samples)
+    print(f"{'':<28} {len(samples) / elapsed:,.0f} requests/s")
+
+
+async def wait_for_service(service: subprocess.Popen[bytes]) -> None:
+    while service.poll() is None:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", PORT)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    sys.exit("The service did not start")
+
+
+async def main(clients: int, count: int) -> None:
+    random.seed(0)
+    with sqlite3.connect(db_path) as conn:
+        texts = [text for (text,) in conn.execute("SELECT text FROM phrase")]
+    words = [quote(word) for word in random.choices(texts, k=count)]
+
+    service = subprocess.Popen(CLI, stderr=subprocess.DEVNULL)
+    try:
+        await wait_for_service(service)
+        reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+        _, headers, _ = await get(reader, writer, f"/lookup?q={words[0]}", {})
+        etag = headers["etag"]
+
+        gzip = {"Accept-Encoding": "gzip"}
+        lookups = [f"/lookup?q={word}" for word in words]
+        await run_clients("lookup", lookups, clients, gzip)
+        await run_clients(
+            "lookup, revalidated", lookups, clients, {**gzip, "If-None-Match": etag}
+        )
+        prefixes = [f"/suggest?q={word[:3]}" for word in words]
+        await run_clients("suggest", prefixes, clients, gzip)
+
+        _, _, body = await get(reader, writer, "/metrics", {})
+        writer.close()
+        print(json.dumps(json.loads(body)["endpoints"], indent=2))
+    finally:
+        service.terminate()
+        service.wait()
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    asyncio.run(main(clients, count))
@@ -10,8 +10,8 @@ import typer
 import word_seek.cli.app
 from word_seek.db import repo
 from word_seek.db.config import APP_ID
-from word_seek.db.models import ViewLog
 from word_seek.db.scaffold import ensure_db
+from word_seek.index import headwords
 
 from . import res
 from .components.dicts import DictionariesPage
@@ -256,19 +256,12 @@ class MainWindow(Adw.ApplicationWindow):
         asyncio.create_task(self.search(phrase))
 
     async def search(self, term: str) -> None:
-        found = await repo.find_phrases(term, 1)
-        if found and found[0].text.strip() == term.strip():
-            phrase = found[0]
-            articles = await repo.find_articles(phrase)
-            self.main_view_content_clear()
+        found = await repo.lookup(term, exact=True)
+        self.main_view_content_clear()
+        if found:
             self.main_view.set_content(self.page)
-            self.page.populate(articles)
-
-            time = datetime.now(timezone.utc)
-            log = ViewLog(phrase_id=phrase.id, shown_at_utc=time)
-            await repo.update_view_log(log)
+            self.page.populate(found.articles)
         else:
-            self.main_view_content_clear()
             self.main_view.set_content(self.no_result_page)
 
     def on_edit_dictionaries(self, *args) -> None:
@@ -276,6 +269,12 @@ class MainWindow(Adw.ApplicationWindow):
         self.dictionaries_page.load()
 
 
+async def open_db() -> None:
+    # the snapshot is checked against the phrases, so the schema comes first
+    await ensure_db()
+    await headwords.load()
+
+
 class Application(Adw.Application):
     def __init__(self):
         Adw.Application.__init__(
@@ -286,7 +285,7 @@ class Application(Adw.Application):
         win = self.props.active_window
         if not win:
             win = MainWindow(application=self)
-            asyncio.create_task(ensure_db())
+            asyncio.create_task(open_db())
         win.present()
 
 
@@ -7,7 +7,7 @@ from collections import OrderedDict
 import gi
 
 from word_seek.db import repo
-from word_seek.db.models import ViewLog
+from word_seek.db.models import ViewLogRow
 from word_seek.utils.models import range_lim
 
 try:
@@ -24,7 +24,7 @@ except (ImportError, ValueError) as exc:
 LOG_COUNT = 10_000
 
 
-def log_day(log: ViewLog) -> date:
+def log_day(log: ViewLogRow) -> date:
     return log.shown_at_utc.replace(tzinfo=timezone.utc).astimezone().date()
 
 
@@ -51,14 +51,14 @@ class HistoryPage(Adw.PreferencesPage):
     def on_delete_items(
         self,
         *args,
-        logs: list[ViewLog] | None = None,
+        logs: list[ViewLogRow] | None = None,
         before: datetime | None = None,
     ) -> None:
         asyncio.create_task(self.delete_items(logs, before))
 
     async def delete_items(
         self,
-        logs: list[ViewLog] | None = None,
+        logs: list[ViewLogRow] | None = None,
         before: datetime | None = None,
     ) -> None:
         await repo.clear_view_logs(
@@ -78,7 +78,7 @@ class HistoryPage(Adw.PreferencesPage):
             grp = Adw.PreferencesGroup(
                 vexpand=True, hexpand=True, title=day.strftime("%Y-%m-%d")
             )
-            phrase_groups = OrderedDict[str, list[ViewLog]]()
+            phrase_groups = OrderedDict[str, list[ViewLogRow]]()
             for log in items:
                 if log.phrase.text not in items:
                     phrase_groups[log.phrase.text] = []
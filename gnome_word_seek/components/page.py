@@ -2,7 +2,7 @@ import asyncio
 import gi
 
 
-from word_seek.db.models import Article, ArticleFormat
+from word_seek.db.models import ArticleFormat, ArticleRow
 from .scroll import Scroll
 from .search import TAG_HIGHLIGHT, TextSearchSelection
 from ..formats import xdxf
@@ -105,19 +105,19 @@ class ArticlesPage(Adw.PreferencesPage):
         self.selection = self.selection.search(text)
         return self.selection
 
-    def populate(self, articles: list[Article]) -> None:
+    def populate(self, articles: list[ArticleRow]) -> None:
         self.scroll.move_start()
         asyncio.create_task(self.animate_populating(articles))
 
-    def _insert_content(self, buffer: Gtk.TextBuffer, article: Article) -> None:
+    def _insert_content(self, buffer: Gtk.TextBuffer, article: ArticleRow) -> None:
         iter = buffer.get_end_iter()
         buffer.insert_with_tags(iter, f"{article.dictionary.title}\n", TAG_DICT)
         if article.dtype == ArticleFormat.XDXF:
-            xdxf.insert_xdxf_buffer(buffer, article.text)
+            xdxf.insert_xdxf_buffer(buffer, article.text, article.tokens)
         else:
             buffer.insert_with_tags(iter, article.text, TAG_TXT)
 
-    async def animate_populating(self, articles: list[Article]) -> None:
+    async def animate_populating(self, articles: list[ArticleRow]) -> None:
         self.clear()
         pause = 0.1 / (len(articles) + 1)
 
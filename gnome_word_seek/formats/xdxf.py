@@ -92,9 +92,11 @@ def setup_tags(tag_table: Gtk.TextTagTable | None = None) -> Gtk.TextTagTable:
     return tag_table
 
 
-def insert_xdxf_buffer(buffer: Gtk.TextBuffer, content: str) -> None:
+def insert_xdxf_buffer(
+    buffer: Gtk.TextBuffer, content: str, tokens: str | None = None
+) -> None:
     try:
-        XdxfVisitor(buffer).visit(f"<root>{content}</root>")
+        XdxfVisitor(buffer).visit(content, tokens)
         return
     except Exception as exc:
         logger.error("XDXF display error", exc)
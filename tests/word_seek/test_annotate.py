@@ -0,0 +1,75 @@
+"""Tests for the annotation of texts"""
+
+import pytest
+
+from word_seek.db import repo
+from word_seek.db.models import Dictionary, PhraseRow, TermMatch
+from word_seek.index import annotate
+from word_seek.index.annotate import Coverage, MatchKind
+
+
+def test_words_keep_their_inner_apostrophes_and_hyphens():
+    """Test that tokens are words, and punctuation around them is dropped."""
+
+    text = "Don't panic: a well-known, 'quoted' café — 42 times!"
+
+    assert list(annotate.tokenize(text)) == [
+        "Don't",
+        "panic",
+        "a",
+        "well-known",
+        "quoted",
+        "café",
+        "42",
+        "times",
+    ]
+
+
+async def test_tokens_missed_as_written_are_matched_normalized(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that each term is queried once and the coverage counts the text."""
+
+    phrases = {"The": 1, "the": 2, "cat": 3, "dog": 4}
+    articles = {1: [10], 2: [10, 20], 3: [20], 4: [10]}
+    queries = list[list[str]]()
+
+    async def match_terms(terms: list[str]) -> list[TermMatch]:
+        queries.append(terms)
+        return [
+            TermMatch(term, PhraseRow(phrases[term], term), articles[phrases[term]])
+            if term in phrases
+            else TermMatch(term, None, [])
+            for term in terms
+        ]
+
+    async def list_dicts() -> list[Dictionary]:
+        dicts = [Dictionary("alpha", "1" * 40), Dictionary("beta", "2" * 40)]
+        dicts[0].id, dicts[1].id = 10, 20
+        return dicts
+
+    monkeypatch.setattr(repo, "match_terms", match_terms)
+    monkeypatch.setattr(repo, "list_dicts", list_dicts)
+
+    found = await annotate.annotate("The cat saw THE Cat and a Dog, cat.")
+
+    assert queries == [
+        ["The", "cat", "saw", "THE", "Cat", "and", "a", "Dog"],
+        ["the", "dog"],
+    ]
+    assert [(hit.token, hit.count, hit.kind) for hit in found.hits] == [
+        ("The", 1, MatchKind.EXACT),
+        ("cat", 2, MatchKind.EXACT),
+        ("saw", 1, None),
+        ("THE", 1, MatchKind.NORMALIZED),
+        ("Cat", 1, MatchKind.NORMALIZED),
+        ("and", 1, None),
+        ("a", 1, None),
+        ("Dog", 1, MatchKind.NORMALIZED),
+    ]
+    assert found.tokens == 9
+    assert found.coverage == [
+        Coverage(None, "all", tokens=6, distinct=5),
+        Coverage(10, "alpha", tokens=3, distinct=3),
+        Coverage(20, "beta", tokens=4, distinct=3),
+    ]
@@ -0,0 +1,36 @@
+"""Tests for autocomplete suggestions"""
+
+import json
+
+from word_seek.eventsrc import autocomplete
+from word_seek.eventsrc.autocomplete import Matches
+
+
+def test_extended_phrase_is_narrowed_from_complete_matches():
+    """Test that complete matches answer longer phrases in the DB order."""
+
+    autocomplete.cache.clear()
+    autocomplete.cache.put(
+        ("ap", None, False),
+        Matches(["ape", "apple", "applet", "apply", "grape", "snapple"], True),
+        0,
+    )
+    autocomplete.cache.put(("p", None, False), Matches(["pea", "ape"], False), 0)
+
+    narrowed = autocomplete._narrow("app", 0)
+
+    assert narrowed == Matches(["apple", "applet", "apply", "snapple"], True)
+    assert autocomplete._narrow("pp", 0) is None
+    assert autocomplete._narrow("app", 1) is None
+
+
+def test_saved_entry_is_loaded_back():
+    """Test that a cache entry survives the round trip through its saved form."""
+
+    key = "ap", "ape", False
+    matches = Matches(["apple"], complete=False)
+
+    item = json.loads(json.dumps(autocomplete._dump_entry(key, matches, 12.5)))
+
+    assert autocomplete._load_entry(item) == (key, matches, 12.5)
+    assert autocomplete._load_entry([item[0], item[1]]) is None
@@ -0,0 +1,48 @@
+"""Tests for LRU cache module"""
+
+from word_seek.utils.cache import LRUCache
+
+
+def test_evicts_by_size():
+    """Test that least recently used entries are evicted to fit the size limit."""
+
+    cache = LRUCache[str, str](10, len)
+    cache.put("a", "aaaa", 0)
+    cache.put("b", "bbbb", 0)
+    assert cache.get("a", 0) == "aaaa"
+    cache.put("c", "cccc", 0)
+    cache.put("huge", "x" * 11, 0)
+
+    assert cache.get("b", 0) is None
+    assert cache.get("a", 0) == "aaaa"
+    assert cache.get("c", 0) == "cccc"
+    assert cache.get("huge", 0) is None
+    assert cache.stats().size == 8
+
+
+def test_generation_change_clears():
+    """Test that a new generation drops stale entries."""
+
+    cache = LRUCache[int, str](100, len)
+    cache.put(1, "one", 0)
+    assert cache.get(1, 1) is None
+    cache.put(1, "uno", 1)
+
+    stats = cache.stats()
+    assert cache.get(1, 1) == "uno"
+    assert (stats.hits, stats.misses, stats.entries) == (0, 1, 1)
+
+
+def test_entries_expire_after_ttl():
+    """Test that an entry older than the TTL is neither returned nor exported."""
+
+    now = [0.0]
+    cache = LRUCache[int, str](100, len, ttl=10, clock=lambda: now[0])
+    cache.put(1, "old", 0)
+    now[0] = 5
+    cache.put(2, "new", 0)
+    now[0] = 12
+
+    assert cache.get(1, 0) is None
+    assert cache.get(2, 0) == "new"
+    assert cache.entries() == [(2, "new", 5)]
@@ -0,0 +1,61 @@
+"""Tests for the daemon protocol and client"""
+
+import asyncio
+import os
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from word_seek.cli.commands import remote
+from word_seek.cli.formats import OutputFormat
+from word_seek.daemon import protocol
+from word_seek.daemon.client import DaemonError, DaemonUnavailable, call
+from word_seek.daemon.server import _serve_client
+
+
+async def test_frames_are_read_back_until_the_stream_ends():
+    """Test that messages survive framing and a cut frame is an error."""
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(protocol.encode({"op": "ping"}) + protocol.encode(["é", 1]))
+    reader.feed_eof()
+
+    assert await protocol.read_message(reader) == {"op": "ping"}
+    assert await protocol.read_message(reader) == ["é", 1]
+    assert await protocol.read_message(reader) is None
+
+    truncated = asyncio.StreamReader()
+    truncated.feed_data(protocol.encode("text")[:-1])
+    truncated.feed_eof()
+    with pytest.raises(protocol.FrameError):
+        await protocol.read_message(truncated)
+
+
+async def test_client_calls_the_server_over_the_socket(tmp_path: Path):
+    """Test that a request gets its reply, and errors and absence are told apart."""
+
+    path = tmp_path / "daemon.sock"
+    with pytest.raises(DaemonUnavailable):
+        call({"op": "ping"}, path)
+
+    handler = partial(_serve_client, set[asyncio.StreamWriter]())
+    async with await asyncio.start_unix_server(handler, path=os.fspath(path)):
+        assert await asyncio.to_thread(call, {"op": "ping"}, path) == os.getpid()
+        with pytest.raises(DaemonError):
+            await asyncio.to_thread(call, {"op": "unknown"}, path)
+
+
+def test_failed_lookup_is_repeated_only_if_it_writes_nothing(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that a lookup logging its view is not redone after a daemon error."""
+
+    def fail(request: dict[str, Any]) -> Any:
+        raise DaemonError("failed")
+
+    monkeypatch.setattr(remote, "call", fail)
+
+    assert remote.lookup_remote("word", OutputFormat.PLAIN, False, False) is None
+    assert remote.lookup_remote("word", OutputFormat.PLAIN, False, True) is False
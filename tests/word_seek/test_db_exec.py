@@ -0,0 +1,60 @@
+"""Tests for the writer and reader engines"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, insert, select, text
+
+from word_seek.db import exec
+
+_numbers = Table("numbers", MetaData(), Column("x", Integer))
+# counts up forever, so only an interrupt ends the statement
+_COUNT_UP = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT x FROM c"
+).columns(x=Integer)
+
+
+@pytest.fixture
+async def engines(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'database.db'}"
+    monkeypatch.setattr(exec, "get_db_connection_url", lambda: url)
+    monkeypatch.setattr(exec, "_engine", None)
+    monkeypatch.setattr(exec, "_read_engine", None)
+    yield exec.get_engine(), exec.get_read_engine()
+    await exec.get_engine().dispose()
+    await exec.get_read_engine().dispose()
+
+
+async def test_engines_pool_a_writer_and_the_readers(engines):
+    """Test that the writer is in WAL mode and the readers only read."""
+
+    writer, reader = engines
+    assert writer.pool.size() == 1
+    assert reader.pool.size() == exec.READ_POOL_SIZE
+
+    async with writer.begin() as conn:
+        assert await conn.scalar(text("PRAGMA journal_mode")) == "wal"
+        await conn.run_sync(_numbers.metadata.create_all)
+        await conn.execute(insert(_numbers).values(x=1))
+    async with reader.connect() as conn:
+        assert await conn.scalar(select(_numbers.c.x)) == 1
+        assert await conn.scalar(text("PRAGMA query_only")) == 1
+
+
+async def test_cancelled_write_interrupts_the_writer(engines):
+    """Test that cancelling a write aborts the statement on the writer."""
+
+    writer, _ = engines
+    async with writer.begin() as conn:
+        await conn.run_sync(_numbers.metadata.create_all)
+
+    async with exec.new_session() as session:
+        work = session.execute(insert(_numbers).from_select(["x"], _COUNT_UP))
+        task = asyncio.ensure_future(exec.interruptible(session, work))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, 5)
+        assert session.sync_session.writing
+        await session.rollback()
@@ -0,0 +1,34 @@
+"""Tests for the coalescing of rendered frames"""
+
+from typing import Any, cast
+
+from curtsies.formatstring import FmtStr, fmtstr
+from curtsies.window import BaseWindow
+
+from word_seek.cli.frames import Frame, FrameScheduler
+
+
+class _Window:
+    def __init__(self) -> None:
+        self.drawn = list[list[FmtStr]]()
+
+    def render_to_terminal(self, lines: list[FmtStr], cursor: Any = None) -> None:
+        self.drawn.append(lines)
+
+
+async def test_pending_frame_is_drawn_on_exit():
+    """Test that a frame requested just before exit is not lost."""
+
+    win = _Window()
+    text = "a"
+
+    def compose() -> Frame:
+        return [fmtstr(text)], (0, len(text))
+
+    with FrameScheduler(cast(BaseWindow, win), compose, interval=60) as frames:
+        frames.request()
+        text = "ab"
+        frames.request()
+
+    assert win.drawn == [[fmtstr("ab")]]
+    assert (frames.requests, frames.frames) == (2, 1)
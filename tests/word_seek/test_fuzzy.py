@@ -0,0 +1,36 @@
+"""Tests for fuzzy deletion index helpers"""
+
+import pytest
+
+from word_seek.index.fuzzy import deletes, deletion_keys, edit_distance
+
+
+def test_deletes():
+    """Test deletion neighbourhood of a short word."""
+
+    assert deletes("abc", 1) == {"abc", "bc", "ac", "ab"}
+    assert deletes("abc", 2) == {"abc", "bc", "ac", "ab", "a", "b", "c"}
+
+
+@pytest.mark.parametrize(
+    ("word", "typo", "distance"),
+    [
+        ("apple", "apple", 0),
+        ("apple", "aple", 1),
+        ("apple", "appel", 1),
+        ("banana", "bnaan", 2),
+        ("application", "aplicaton", 2),
+        ("apple", "orange", 3),
+    ],
+)
+def test_edit_distance(word: str, typo: str, distance: int):
+    """Test capped optimal string alignment distance."""
+
+    assert edit_distance(word, typo) == distance
+
+
+def test_typo_shares_deletion_key():
+    """Test that headwords within the distance are reachable by keys."""
+
+    assert deletion_keys("Application") & deletion_keys("aplpication")
+    assert deletion_keys("banana") & deletion_keys("bnaan")
@@ -0,0 +1,39 @@
+"""Tests for headword snapshot module"""
+
+from pathlib import Path
+
+from word_seek.index.snapshot import HeadwordSnapshot, write_snapshot
+
+STAMP = b"s" * 20
+
+
+def test_prefixed(tmp_path: Path):
+    """Test prefix lookups follow the byte order of UTF-8 headwords."""
+
+    path = tmp_path / "headwords.snapshot"
+    write_snapshot(path, ["band", "apple", "Apple", "apply", "été", "app"], STAMP)
+
+    snapshot = HeadwordSnapshot.open(path)
+
+    assert snapshot is not None
+    assert snapshot.stamp == STAMP
+    assert len(snapshot) == 6
+    assert snapshot.prefixed("app", 10) == ["app", "apple", "apply"]
+    assert snapshot.prefixed("app", 1, after="app") == ["apple"]
+    assert snapshot.prefixed("app", 10, after="apply") == []
+    assert snapshot.prefixed("é", 10) == ["été"]
+    assert snapshot.prefixed("c", 10) == []
+    snapshot.close()
+
+
+def test_corrupted_snapshot_is_rejected(tmp_path: Path):
+    """Test that a damaged payload fails the checksum."""
+
+    path = tmp_path / "headwords.snapshot"
+    write_snapshot(path, ["apple", "band"], STAMP)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(data)
+
+    assert HeadwordSnapshot.open(path) is None
+    assert HeadwordSnapshot.open(tmp_path / "missing.snapshot") is None
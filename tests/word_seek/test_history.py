@@ -0,0 +1,40 @@
+"""Tests for the paging of the history selector"""
+
+from datetime import datetime
+
+from word_seek.cli.components.history._ctrl import ITEM_COUNT, turn_page
+from word_seek.db.models import PhraseRow, ViewLogRow
+
+
+def _logs(count: int) -> list[ViewLogRow]:
+    shown_at = datetime(2026, 1, 1)
+    return [ViewLogRow(i, i, PhraseRow(i, f"w{i}"), shown_at) for i in range(count)]
+
+
+def test_keys_in_an_empty_history_stay_on_the_first_page():
+    """Test that no page is turned, and nothing refetched, without logs."""
+
+    pages = list[ViewLogRow | None]()
+    assert turn_page(pages, [], -1) is None
+    assert pages == [None]
+
+    for idx in (1, ITEM_COUNT, -1, -ITEM_COUNT):
+        assert turn_page(pages, [], idx) == 0
+    assert pages == [None]
+
+
+def test_pages_turn_only_when_there_is_another_page():
+    """Test that moves past the ends turn the page or clamp the index."""
+
+    logs = _logs(ITEM_COUNT + 1)
+    pages = list[ViewLogRow | None]([None])
+    assert turn_page(pages, logs, ITEM_COUNT) is None
+    assert pages == [None, logs[ITEM_COUNT - 1]]
+    assert turn_page(pages, logs, -1) is None
+    assert pages == [None]
+
+    last = _logs(3)
+    assert turn_page(pages, last, 3) == 2
+    assert turn_page(pages, last, ITEM_COUNT + 2) == 2
+    assert turn_page(pages, last, -ITEM_COUNT) == 0
+    assert pages == [None]
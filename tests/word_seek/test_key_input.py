@@ -0,0 +1,54 @@
+"""Tests for decoding terminal input"""
+
+import asyncio
+import os
+
+import pytest
+
+from word_seek.eventsrc.input import _key_input
+from word_seek.eventsrc.input._key_input import InputScope, decode_keys
+from word_seek.eventsrc.input.models import KeyEvent
+
+
+def test_read_is_split_into_keys():
+    """Test that one read yields its keys, escape sequences included."""
+
+    data = "aé\x1b[B\x1b[6~\t\x1b".encode()
+
+    keys, rest = decode_keys(data, "utf-8", full=True)
+
+    assert keys == ["a", "é", "<DOWN>", "<PAGEDOWN>", "<TAB>", "<ESC>"]
+    assert rest == b""
+
+
+def test_keys_split_between_reads_are_left_for_the_next_one():
+    """Test that a partial key is kept undecoded unless the input is full."""
+
+    assert decode_keys(b"a\xc3", "utf-8") == (["a"], b"\xc3")
+    assert decode_keys(b"\xc3\xa9", "utf-8") == (["é"], b"")
+    assert decode_keys(b"b\x1b[", "utf-8") == (["b"], b"\x1b[")
+    assert decode_keys(b"\x1b[A", "utf-8") == (["<UP>"], b"")
+    assert decode_keys(b"\x1b", "utf-8", full=True) == (["<ESC>"], b"")
+
+
+async def test_scope_joins_reads_and_flushes_a_lone_escape(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that split keys arrive whole, and a lone ESC after the timeout."""
+
+    monkeypatch.setattr(_key_input, "KEY_TIMEOUT", 0.01)
+    read_fd, write_fd = os.pipe()
+    scope = InputScope()
+    scope._fd, scope._encoding = read_fd, "utf-8"
+    scope._loop = asyncio.get_running_loop()
+    try:
+        for data in [b"\xc3", b"\xa9\x1b[", b"A", b"\x1b"]:
+            os.write(write_fd, data)
+            scope._on_readable()
+        assert scope._queue.qsize() == 2
+
+        events = [await asyncio.wait_for(scope.next_event(), 1) for _ in range(3)]
+        assert events == [KeyEvent("é"), KeyEvent("<UP>"), KeyEvent("<ESC>")]
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
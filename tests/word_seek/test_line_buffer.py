@@ -0,0 +1,41 @@
+"""Tests for the pager line buffer"""
+
+from collections.abc import Iterator
+
+from curtsies.formatstring import fmtstr
+
+from word_seek.cli.components.view._models import ArticleLine, LineBuffer
+
+
+def make_lines(consumed: list[int]) -> Iterator[ArticleLine]:
+    for section in range(100):
+        consumed.append(section)
+        yield fmtstr(f"dict {section}"), True
+        yield fmtstr(f"wide line {section} " + "x" * 20), False
+
+
+def test_lines_are_rendered_on_demand():
+    """Test that only the lines needed for the requested rows are consumed."""
+
+    consumed = list[int]()
+    buffer = LineBuffer(make_lines(consumed), width=20)
+
+    assert buffer.ensure(5) == 6
+    assert consumed == [0, 1]
+    assert buffer.rows[1].s == "wide line 0 xxxxxxxx"
+    assert buffer.line_of(2) == 1
+    assert buffer.next_section(0) == 3
+    assert buffer.prev_section(3) == 0
+    assert buffer.title_of(4) == "dict 1"
+    assert not buffer.exhausted
+
+
+def test_find():
+    """Test searching forward and backward by line, case-insensitively."""
+
+    buffer = LineBuffer(make_lines([]), width=80)
+
+    assert buffer.find("LINE 42", 0) == 85
+    assert buffer.find("line 3 ", 85, backward=True) == 7
+    assert buffer.find("missing", 0) is None
+    assert buffer.exhausted
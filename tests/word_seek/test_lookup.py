@@ -0,0 +1,105 @@
+"""Tests for the one-shot lookup output"""
+
+import io
+import json
+
+import pytest
+
+from word_seek.cli.commands.lookup import format_lookup, format_term, read_terms
+from word_seek.cli.formats import OutputFormat
+from word_seek.cli.formats.xdxf import XdxfText, iter_xdxf_lines, iter_xdxf_text
+from word_seek.db.models import (
+    ArticleFormat,
+    ArticleRow,
+    DictionaryRow,
+    Phrase,
+    PhraseLookup,
+    PhraseRow,
+    TermLookup,
+)
+
+DICTIONARY = DictionaryRow(1, "alpha", None)
+FOUND = PhraseLookup(
+    Phrase(text="cat"),
+    [
+        ArticleRow(1, 1, DICTIONARY, 0, ArticleFormat.XDXF, "<k>cat</k>\n a pet", None),
+        ArticleRow(2, 1, DICTIONARY, 1, ArticleFormat.TEXT, "cat: a pet\n", None),
+    ],
+)
+
+
+def test_plain_output_has_no_escapes():
+    """Test that plain output lists the articles as text under their titles."""
+
+    output = format_lookup(FOUND, OutputFormat.PLAIN)
+
+    assert "\x1b" not in output
+    assert output.splitlines() == [
+        "cat",
+        "",
+        "alpha",
+        "cat",
+        " a pet",
+        "",
+        "alpha",
+        "cat: a pet",
+    ]
+    assert "\x1b[" in format_lookup(FOUND, OutputFormat.ANSI)
+
+
+def test_json_output_keeps_rendered_and_source_text():
+    """Test that JSON output carries the plain text along with the source."""
+
+    output = json.loads(format_lookup(FOUND, OutputFormat.JSON))
+
+    assert output["phrase"] == "cat"
+    assert output["articles"][0] == {
+        "dictionary": "alpha",
+        "format": "xdxf",
+        "text": "cat\n a pet",
+        "source": "<k>cat</k>\n a pet",
+    }
+
+
+def test_plain_text_matches_styled_lines():
+    """Test that the plain XDXF walk gives the text of the styled lines."""
+
+    xml = (
+        '<k>a</k> <c c="red">b<rref>r.wav</rref></c>\n'
+        '<blockquote>one\n<ex>two</ex> <iref href="x.org">link</iref></blockquote>'
+        "<blockquote><blockquote>deep\ndeeper</blockquote></blockquote>tail"
+    )
+
+    styled = [line.s for line in iter_xdxf_lines(xml)]
+
+    assert list(iter_xdxf_text(xml)) == styled
+    assert styled[:3] == ["a b", " one", " two link ➤ x.org"]
+
+
+def test_failed_render_shows_no_line_twice(monkeypatch: pytest.MonkeyPatch):
+    """Test that raw markup replaces an article only before its first line."""
+
+    def segment(self: XdxfText, text: str, outer: bool = False) -> str:
+        if text == "boom":
+            raise ValueError(text)
+        return text
+
+    monkeypatch.setattr(XdxfText, "segment", segment)
+
+    assert list(iter_xdxf_text("<k>a</k>\nb\n<i>boom</i>")) == ["a", "b"]
+    assert list(iter_xdxf_text("<i>boom</i>")) == ["<i>boom</i>"]
+
+
+def test_batch_terms_are_chunked_and_printed_per_line():
+    """Test that blank lines are skipped and every term gets a JSON line."""
+
+    source = io.StringIO("cat\n\n  dog \nemu\n")
+
+    assert list(read_terms(source, 2)) == [["cat", "dog"], ["emu"]]
+    assert json.loads(format_term(TermLookup("emu", None, []))) == {
+        "term": "emu",
+        "phrase": None,
+        "articles": [],
+    }
+    found = TermLookup("cat", PhraseRow(1, "cat"), FOUND.articles[1:])
+    assert json.loads(format_term(found))["articles"][0]["text"] == "cat: a pet"
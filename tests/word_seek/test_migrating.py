@@ -0,0 +1,17 @@
+"""Tests for the schema version check"""
+
+from importlib import resources
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from word_seek.db.migrating import HEAD_REVISION
+
+
+def test_head_revision_matches_scripts():
+    """Test that the compiled-in head is the head of the migration scripts."""
+
+    with resources.as_file(resources.files("word_seek") / "alembic.ini") as config_path:
+        scripts = ScriptDirectory.from_config(Config(config_path))
+
+    assert scripts.get_current_head() == HEAD_REVISION
@@ -0,0 +1,67 @@
+"""Tests for the Rx helpers"""
+
+import asyncio
+from collections.abc import Awaitable
+from functools import partial
+
+from reactivex import operators as op
+from reactivex.subject import Subject
+
+from word_seek.rxutil import async_observable
+
+
+async def test_switch_cancels_previous_awaitable():
+    """Test that a new item cancels the awaitable started for the previous one."""
+
+    loop = asyncio.get_running_loop()
+    cancelled = list[str]()
+
+    async def work(name: str) -> str:
+        try:
+            await asyncio.sleep(0 if name == "last" else 10)
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+        return name
+
+    source = Subject[str]()
+    results = list[str]()
+    latest = source.pipe(
+        op.map(lambda name: async_observable(partial(work, name), loop)),
+        op.switch_latest(),
+    )
+    with latest.subscribe(on_next=results.append):
+        source.on_next("first")
+        await asyncio.sleep(0.01)
+        source.on_next("last")
+        await asyncio.sleep(0.01)
+
+    assert cancelled == ["first"]
+    assert results == ["last"]
+
+
+async def test_switch_in_one_tick_creates_only_the_last_awaitable():
+    """Test that an awaitable dropped before its task starts is never created."""
+
+    loop = asyncio.get_running_loop()
+    created = list[str]()
+
+    async def work(name: str) -> str:
+        return name
+
+    def start(name: str) -> Awaitable[str]:
+        created.append(name)
+        return work(name)
+
+    source = Subject[str]()
+    results = list[str]()
+    latest = source.pipe(
+        op.map(lambda name: async_observable(partial(start, name), loop)),
+        op.switch_latest(),
+    )
+    with latest.subscribe(on_next=results.append):
+        source.on_next("first")
+        source.on_next("last")
+        await asyncio.sleep(0.01)
+
+    assert created == results == ["last"]
@@ -0,0 +1,75 @@
+"""Tests for compiled XDXF token streams"""
+
+from collections.abc import Mapping
+
+from word_seek.formats import tokens
+from word_seek.formats.visitor import XmlNodeVisitor
+
+
+class _Recorder(XmlNodeVisitor):
+    def __init__(self) -> None:
+        super().__init__()
+        self.events = list[str]()
+
+    def visit_tag(self, tag: str, attrs: Mapping[str, str]) -> None:
+        self.events.append(f"<{tag}{''.join(f' {k}={v}' for k, v in attrs.items())}>")
+        if tag != "rref":
+            super().visit_tag(tag, attrs)
+        self.events.append(f"</{tag}>")
+
+    def visit_text(self, text: str) -> None:
+        self.events.append(text)
+
+
+def test_replay_matches_parse():
+    """Test that replaying stored tokens visits the same nodes as parsing."""
+
+    xml = '<k>a</k> <x:c c="red">b<rref>r.wav</rref></x:c>\n<b>c</b>'
+    parsed, replayed = _Recorder(), _Recorder()
+    parsed.visit(xml)
+    replayed.visit("", tokens.dumps(tokens.compile_xdxf(xml)))
+
+    assert replayed.events == parsed.events
+    assert parsed.events == [
+        "<k>", "a", "</k>", " ",
+        "<c c=red>", "b", "<rref>", "</rref>", "</c>", "\n",
+        "<b>", "c", "</b>",
+    ]  # fmt: skip
+
+
+def test_stale_tokens_are_rejected():
+    """Test that other versions and unbalanced streams are not replayed."""
+
+    assert tokens.loads('[2,["k"],[0,"a",null]]') is None
+    assert tokens.loads("2\x05k\x05\x01 a\x03") is None
+    assert tokens.loads("3\x05k\x05\x01 a") is None
+    assert tokens.loads("3\x05k\x05\x01!a\x03") is None
+    assert tokens.loads("3\x05k\x05\x02 c\x05a\x03") is None
+    assert tokens.loads("not a stream") is None
+    assert tokens.loads("3\x05k\x05\x01 a\x03") is not None
+
+
+def test_streams_survive_their_stored_form():
+    """Test that control characters round-trip and the stored form is compact."""
+
+    stream = tokens.compile_xdxf(
+        '<k>a\x01b</k><c c="r\x04d" x="">\x05\x06A<br/></c>&lt;\x03'
+    )
+    stored = tokens.dumps(stream)
+
+    assert tokens.loads(stored) == stream
+
+    xml = '<k>cat</k> <tr>kæt</tr>\n<blockquote><c c="red">n.</c> a pet</blockquote>'
+    assert len(tokens.dumps(tokens.compile_xdxf(xml))) < len(xml)
+
+
+def test_malformed_markup_is_recovered():
+    """Test that void, stray and unclosed tags still yield a balanced stream."""
+
+    recorder = _Recorder()
+    recorder.visit("<k>a<br>b</x></k>\n  <b><i>c</b>d<!-- note --><i>e")
+
+    assert recorder.events == [
+        "<k>", "a", "<br>", "</br>", "b", "</k>", "\n",
+        "<b>", "<i>", "c", "</i>", "</b>", "d", "<i>", "e", "</i>",
+    ]  # fmt: skip
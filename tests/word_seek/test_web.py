@@ -0,0 +1,132 @@
+"""Tests for the HTTP service"""
+
+import asyncio
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+
+from word_seek.daemon.web import (
+    Endpoint,
+    HttpError,
+    Request,
+    Response,
+    WebService,
+    encode_response,
+    read_request,
+)
+from word_seek.db import repo
+
+
+def _request(path: str, **headers: str) -> Request:
+    return Request("GET", path, {}, headers, keep_alive=True)
+
+
+async def test_requests_are_read_until_the_connection_ends():
+    """Test that pipelined requests are parsed and the connection rules kept."""
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(
+        b"GET /lookup?q=caf%C3%A9&exact=1 HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        b"HEAD /dicts HTTP/1.0\r\n\r\n"
+    )
+    reader.feed_eof()
+
+    request = await read_request(reader)
+    assert request == Request(
+        "GET", "/lookup", {"q": "café", "exact": "1"}, {"host": "localhost"}, True
+    )
+    request = await read_request(reader)
+    assert request is not None
+    assert (request.method, request.keep_alive) == ("HEAD", False)
+    assert await read_request(reader) is None
+
+
+def test_large_bodies_are_gzipped_for_clients_that_accept_it():
+    """Test that gzip depends on the body size and Accept-Encoding."""
+
+    body = {"suggestions": ["word"] * 500}
+    response = Response(HTTPStatus.OK, body)
+    plain = encode_response(response, _request("/suggest"), keep_alive=True)
+    assert b"Content-Encoding" not in plain
+
+    request = _request("/suggest", **{"accept-encoding": "br, gzip;q=0.8"})
+    encoded = encode_response(response, request, keep_alive=True)
+    head, payload = encoded.split(b"\r\n\r\n", 1)
+    assert b"Content-Encoding: gzip" in head
+    assert f"Content-Length: {len(payload)}".encode() in head
+    assert json.loads(gzip.decompress(payload)) == body
+
+    refused = _request("/suggest", **{"accept-encoding": "gzip;q=0"})
+    assert b"gzip" not in encode_response(response, refused, keep_alive=False)
+
+
+async def test_requests_over_the_limit_are_turned_away():
+    """Test that queued requests wait for a slot and the overflow gets 503."""
+
+    release = asyncio.Event()
+
+    async def slow(request: Request) -> Response:
+        await release.wait()
+        return Response(HTTPStatus.OK, [])
+
+    service = WebService({"/slow": Endpoint(slow)}, max_concurrent=1, max_waiting=1)
+    running = asyncio.ensure_future(service.respond(_request("/slow")))
+    waiting = asyncio.ensure_future(service.respond(_request("/slow")))
+    await asyncio.sleep(0)
+
+    rejected = await service.respond(_request("/slow"))
+    assert rejected.status == HTTPStatus.SERVICE_UNAVAILABLE
+    assert "Retry-After" in rejected.headers
+
+    release.set()
+    assert (await running).status == (await waiting).status == HTTPStatus.OK
+    metrics = await service.respond(_request("/metrics"))
+    assert metrics.body["endpoints"]["/slow"]["requests"] == 3
+    assert metrics.body["endpoints"]["/slow"]["rejected"] == 1
+
+
+async def test_requests_to_other_hosts_are_refused():
+    """Test that a rebound domain in the Host header is not served."""
+
+    for host, allowed in [
+        (b"localhost:8765", True),
+        (b"127.0.0.1", True),
+        (b"evil.example:8765", False),
+        (b"localhost.evil.example", False),
+    ]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"GET /dicts HTTP/1.1\r\nHost: " + host + b"\r\n\r\n")
+        reader.feed_eof()
+        if allowed:
+            assert await read_request(reader) is not None
+        else:
+            with pytest.raises(HttpError) as error:
+                await read_request(reader)
+            assert error.value.status == HTTPStatus.MISDIRECTED_REQUEST
+
+
+async def test_tagged_responses_are_revalidated_weakly(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that the weak tag of either encoding gets a 304."""
+
+    async def get_content_generation() -> int:
+        return 7
+
+    async def dicts(request: Request) -> Response:
+        return Response(HTTPStatus.OK, [])
+
+    monkeypatch.setattr(repo, "get_content_generation", get_content_generation)
+    service = WebService({"/dicts": Endpoint(dicts, tagged=True)})
+
+    response = await service.respond(_request("/dicts"))
+    assert (response.status, response.etag) == (HTTPStatus.OK, 'W/"7"')
+    for tag in ['W/"7"', '"7"', 'W/"6", W/"7"']:
+        revalidated = await service.respond(
+            _request("/dicts", **{"if-none-match": tag})
+        )
+        assert revalidated.status == HTTPStatus.NOT_MODIFIED
+    changed = await service.respond(_request("/dicts", **{"if-none-match": 'W/"6"'}))
+    assert changed.status == HTTPStatus.OK
@@ -1,9 +1,11 @@
 import asyncio
+import sys
 from pathlib import Path
 
 import typer
 
 from . import commands as cmd
+from .formats import OutputFormat
 
 history_app = typer.Typer()
 dicts_app = typer.Typer()
@@ -22,6 +24,72 @@ def wipeout_db():
     asyncio.run(cmd.wipeout_db())
 
 
+@app.command()
+def lookup(
+    phrase: str = typer.Argument(None),
+    output: OutputFormat = OutputFormat.AUTO,
+    exact: bool = False,
+    batch: bool = typer.Option(False, help="Look up a term per line of stdin."),
+    file: Path = typer.Option(None, help="Read the batch terms from a file."),
+    log_views: bool = typer.Option(False, help="Add the lookups to the history."),
+):
+    if not batch:
+        if phrase is None or file is not None:
+            raise typer.BadParameter("give a PHRASE, or --batch for a list of terms")
+        found = cmd.lookup_remote(phrase, output, exact, log_views)
+        if found is None:
+            found = asyncio.run(cmd.lookup_phrase(phrase, output, exact, log_views))
+        if not found:
+            raise typer.Exit(1)
+        return
+
+    if phrase is not None or output not in (OutputFormat.AUTO, OutputFormat.JSON):
+        raise typer.BadParameter("--batch reads the terms and prints JSON lines")
+    if file is None:
+        asyncio.run(cmd.lookup_batch(sys.stdin, log_views))
+    else:
+        with file.open(encoding="utf-8") as source:
+            asyncio.run(cmd.lookup_batch(source, log_views))
+
+
+@app.command()
+def annotate(file: Path = typer.Argument(..., help="A text file, or - for stdin.")):
+    """Look up every word of a text at once, with the dictionary coverage"""
+
+    if str(file) == "-":
+        found = asyncio.run(cmd.annotate_text(sys.stdin))
+    else:
+        with file.open(encoding="utf-8") as source:
+            found = asyncio.run(cmd.annotate_text(source))
+    if not found:
+        raise typer.Exit(1)
+
+
+@app.command()
+def suggest(phrase: str, limit: int = 20):
+    found = cmd.suggest_remote(phrase, limit)
+    if found is None:
+        found = asyncio.run(cmd.suggest_phrases(phrase, limit))
+    if not found:
+        raise typer.Exit(1)
+
+
+@app.command()
+def daemon():
+    """Keep the database and caches warm, serving lookup and suggest"""
+
+    if not asyncio.run(cmd.run_daemon()):
+        raise typer.Exit(1)
+
+
+@app.command()
+def serve_http(port: int = 8765):
+    """Serve suggest, lookup, history and dicts as JSON over HTTP on localhost"""
+
+    if not asyncio.run(cmd.run_web(port)):
+        raise typer.Exit(1)
+
+
 @app.callback(invoke_without_command=True)
 def enter_search(ctx: typer.Context):
     if ctx.invoked_subcommand is None:
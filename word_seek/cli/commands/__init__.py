@@ -1,17 +1,65 @@
-from .imports import import_dir
-from .history import browse_history, clear_history, flush_history
-from .dicts import list_dicts, sort_dict
-from .wipeout import wipeout_db
-from .search import enter_search
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .annotate import annotate_text
+    from .daemon import run_daemon
+    from .dicts import list_dicts, sort_dict
+    from .history import browse_history, clear_history, flush_history
+    from .imports import import_dir
+    from .lookup import lookup_batch, lookup_phrase
+    from .remote import lookup_remote, suggest_remote
+    from .search import enter_search
+    from .suggest import suggest_phrases
+    from .web import run_web
+    from .wipeout import wipeout_db
+
+# Commands are imported on first use, so that each one loads only the
+# libraries it needs.
+_MODULES = {
+    "annotate_text": "annotate",
+    "browse_history": "history",
+    "clear_history": "history",
+    "enter_search": "search",
+    "flush_history": "history",
+    "import_dir": "imports",
+    "list_dicts": "dicts",
+    "lookup_batch": "lookup",
+    "lookup_phrase": "lookup",
+    "lookup_remote": "remote",
+    "run_daemon": "daemon",
+    "run_web": "web",
+    "sort_dict": "dicts",
+    "suggest_phrases": "suggest",
+    "suggest_remote": "remote",
+    "wipeout_db": "wipeout",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = import_module(f".{_MODULES[name]}", __name__)
+    # replaces the submodule that the import bound under the same name
+    value = globals()[name] = getattr(module, name)
+    return value
 
 
 __all__ = [
+    "annotate_text",
     "browse_history",
     "clear_history",
     "enter_search",
     "flush_history",
     "import_dir",
     "list_dicts",
+    "lookup_batch",
+    "lookup_phrase",
+    "lookup_remote",
+    "run_daemon",
+    "run_web",
     "sort_dict",
+    "suggest_phrases",
+    "suggest_remote",
     "wipeout_db",
 ]
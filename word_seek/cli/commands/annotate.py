@@ -0,0 +1,52 @@
+import json
+import sys
+import time
+from typing import TextIO
+
+from anyio import to_thread
+
+from ...index.annotate import Annotation, TokenHit, annotate
+
+
+def format_hit(hit: TokenHit, titles: dict[int, str]) -> str:
+    item = {
+        "token": hit.token,
+        "count": hit.count,
+        "match": hit.kind,
+        "phrase": hit.phrase.text if hit.phrase else None,
+        "dictionaries": [titles[id] for id in hit.dictionary_ids if id in titles],
+    }
+    return json.dumps(item, ensure_ascii=False)
+
+
+def format_coverage(annotation: Annotation) -> list[str]:
+    distinct = len(annotation.hits)
+    lines = [f"{annotation.tokens:,} tokens, {distinct:,} distinct"]
+    for item in annotation.coverage:
+        tokens = item.tokens / annotation.tokens if annotation.tokens else 0
+        types = item.distinct / distinct if distinct else 0
+        lines.append(f"{item.title}: {tokens:.1%} of tokens, {types:.1%} of distinct")
+    return lines
+
+
+async def annotate_text(source: TextIO) -> bool:
+    """
+    Print a JSON line for each distinct token of the text, in the order they
+    first appear, then the coverage of the dictionaries to stderr. False if no
+    token is found.
+    """
+
+    start = time.perf_counter()
+    annotation = await annotate(await to_thread.run_sync(source.read))
+    titles = {
+        c.dictionary_id: c.title
+        for c in annotation.coverage
+        if c.dictionary_id is not None
+    }
+    sys.stdout.write("".join(format_hit(hit, titles) + "\n" for hit in annotation.hits))
+
+    elapsed = time.perf_counter() - start
+    for line in format_coverage(annotation):
+        print(line, file=sys.stderr)
+    print(f"{annotation.tokens / elapsed:,.0f} words/s", file=sys.stderr)
+    return any(hit.phrase for hit in annotation.hits)
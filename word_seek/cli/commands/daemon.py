@@ -0,0 +1,14 @@
+import sys
+
+from ...daemon.server import DaemonRunning, serve
+from ...db.config import get_socket_path
+
+
+async def run_daemon() -> bool:
+    path = get_socket_path()
+    try:
+        await serve(path)
+    except DaemonRunning as exc:
+        print(exc, file=sys.stderr)
+        return False
+    return True
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+from typing import Any, Final, TextIO
+
+from anyio import to_thread
+from curtsies.formatstring import fmtstr
+
+from ...db import repo
+from ...db.exec import READ_POOL_SIZE
+from ...db.models import ArticleRow, PhraseLookup, TermLookup
+from ..formats import OutputFormat
+from ..formats.articles import fmt_title, iter_article_lines, iter_article_text
+
+# terms per query of a batch, and the queries run at once: one per reader
+BATCH_SIZE: Final = 500
+BATCH_CONCURRENCY: Final = READ_POOL_SIZE
+
+
+def article_json(article: ArticleRow) -> dict[str, Any]:
+    return {
+        "dictionary": article.dictionary.title,
+        "format": article.dtype.value,
+        "text": "\n".join(iter_article_text(article)),
+        "source": article.text,
+    }
+
+
+def format_lookup(found: PhraseLookup, output: OutputFormat) -> str:
+    if output == OutputFormat.JSON:
+        articles = [article_json(a) for a in found.articles]
+        return json.dumps(
+            {"phrase": found.phrase.text, "articles": articles}, ensure_ascii=False
+        )
+
+    if output == OutputFormat.PLAIN:
+        lines = [found.phrase.text]
+        for a in found.articles:
+            lines += ["", a.dictionary.title, *iter_article_text(a)]
+        return "\n".join(lines)
+
+    fmt_lines = [fmtstr(found.phrase.text, bold=True)]
+    for a in found.articles:
+        fmt_lines += [fmtstr(""), fmt_title(a), *iter_article_lines(a)]
+    return "\n".join(str(line) for line in fmt_lines)
+
+
+def format_term(found: TermLookup) -> str:
+    item = {
+        "term": found.term,
+        "phrase": found.phrase.text if found.phrase else None,
+        "articles": [article_json(a) for a in found.articles],
+    }
+    return json.dumps(item, ensure_ascii=False)
+
+
+async def lookup_phrase(
+    phrase: str, output: OutputFormat, exact: bool, log_view: bool
+) -> bool:
+    """Print the articles of the phrase; False if nothing is found"""
+
+    found = await repo.lookup(phrase, exact=exact, log_view=log_view)
+    if found is None:
+        print("No phrases are found.", file=sys.stderr)
+        return False
+
+    print(format_lookup(found, output.resolve()))
+    return True
+
+
+def read_terms(source: TextIO, size: int) -> Iterator[list[str]]:
+    chunk = list[str]()
+    for line in source:
+        if term := line.strip():
+            chunk.append(term)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def lookup_batch(source: TextIO, log_views: bool) -> None:
+    """
+    Print a JSON line for each term, the terms being the lines of the source.
+
+    Terms are matched exactly, a chunk per query, and a few chunks are looked up
+    at once while the earlier ones are printed in order. The rate goes to stderr.
+    """
+
+    async def write(pending: asyncio.Future[list[TermLookup]]) -> int:
+        found = await pending
+        if log_views:
+            await repo.add_view_logs([f.phrase.id for f in found if f.phrase])
+        sys.stdout.write("".join(format_term(f) + "\n" for f in found))
+        return len(found)
+
+    start, count = time.perf_counter(), 0
+    chunks = read_terms(source, BATCH_SIZE)
+    pending = deque[asyncio.Future[list[TermLookup]]]()
+    # the source may be a slow pipe, so it is read off the loop
+    while chunk := await to_thread.run_sync(next, chunks, None):
+        pending.append(asyncio.ensure_future(repo.lookup_terms(chunk)))
+        if len(pending) == BATCH_CONCURRENCY:
+            count += await write(pending.popleft())
+    while pending:
+        count += await write(pending.popleft())
+
+    elapsed = time.perf_counter() - start
+    print(f"{count} words, {count / elapsed:,.0f} words/s", file=sys.stderr)
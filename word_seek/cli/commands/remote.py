@@ -0,0 +1,60 @@
+import sys
+from typing import Any
+
+from ...daemon.client import DaemonError, DaemonUnavailable, call
+from ..formats import OutputFormat
+
+# Commands served by a running daemon. They return None when there is no
+# daemon, so the caller falls back to doing the work in-process; nothing here
+# loads the database layer.
+
+
+def _call(request: dict[str, Any], writes: bool = False) -> tuple[bool, Any]:
+    """
+    Whether the daemon served the request, and its result. The DaemonError of a
+    request that writes is raised: the daemon may have written already, so the
+    request is not repeated in-process.
+    """
+
+    try:
+        return True, call(request)
+    except DaemonUnavailable:
+        return False, None
+    except DaemonError as exc:
+        if writes:
+            raise
+        print(f"The daemon failed, working in-process: {exc}", file=sys.stderr)
+        return False, None
+
+
+def lookup_remote(
+    phrase: str, output: OutputFormat, exact: bool, log_view: bool
+) -> bool | None:
+    request = {
+        "op": "lookup",
+        "phrase": phrase,
+        "output": output.resolve(),
+        "exact": exact,
+        "log_view": log_view,
+    }
+    try:
+        served, text = _call(request, writes=log_view)
+    except DaemonError as exc:
+        print(f"The daemon failed: {exc}", file=sys.stderr)
+        return False
+    if not served:
+        return None
+    if text is None:
+        print("No phrases are found.", file=sys.stderr)
+        return False
+    print(text)
+    return True
+
+
+def suggest_remote(phrase: str, limit: int) -> bool | None:
+    served, suggestions = _call({"op": "suggest", "phrase": phrase, "limit": limit})
+    if not served:
+        return None
+    for text in suggestions:
+        print(text)
+    return bool(suggestions)
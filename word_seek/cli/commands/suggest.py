@@ -0,0 +1,13 @@
+from ...eventsrc import autocomplete
+from ...eventsrc.autocomplete import PhrasesQuery
+from ...index import headwords
+
+
+async def suggest_phrases(phrase: str, limit: int) -> bool:
+    """Print the suggestions the search would show, a phrase per line"""
+
+    await headwords.load()
+    found = await autocomplete.find_phrases(PhrasesQuery(phrase, limit))
+    for text in found.suggestions:
+        print(text)
+    return bool(found.suggestions)
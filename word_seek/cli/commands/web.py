@@ -0,0 +1,13 @@
+import sys
+
+from ...daemon.web import HOST, serve
+
+
+async def run_web(port: int) -> bool:
+    print(f"Serving on http://{HOST}:{port}", file=sys.stderr)
+    try:
+        await serve(port)
+    except OSError as exc:
+        print(exc, file=sys.stderr)
+        return False
+    return True
@@ -1,6 +1,22 @@
-from .input import input
-from .history import select_history
-from .view import view
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .history import select_history
+    from .input import input
+    from .view import view
+
+# imported on first use, see word_seek.cli.commands
+_MODULES = {"input": "input", "select_history": "history", "view": "view"}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = import_module(f".{_MODULES[name]}", __name__)
+    # replaces the submodule that the import bound under the same name
+    value = globals()[name] = getattr(module, name)
+    return value
 
 
 __all__ = ["input", "select_history", "view"]
@@ -1,17 +1,23 @@
 from datetime import timezone
-from itertools import chain
+from types import EllipsisType
 
 from curtsies.formatstring import FmtStr, fmtstr
 from curtsies.window import CursorAwareWindow
 
 from ....db import repo
-from ....db.models import ViewLog
-from ....eventsrc.input import InputScope, KeyEvent, SigIntEvent, keys
+from ....db.models import ViewLogRow
+from ....eventsrc.input import (
+    InputEvent,
+    InputScope,
+    KeyEvent,
+    SigIntEvent,
+    keys,
+)
 
 ITEM_COUNT = 10
 
 
-def render_logs(logs: list[ViewLog], select_idx: int) -> list[FmtStr]:
+def render_logs(logs: list[ViewLogRow], select_idx: int) -> list[FmtStr]:
     lines = list[FmtStr]()
     for idx, log in enumerate(logs):
         date = log.shown_at_utc.replace(tzinfo=timezone.utc).astimezone()
@@ -20,22 +26,42 @@ def render_logs(logs: list[ViewLog], select_idx: int) -> list[FmtStr]:
     return lines
 
 
-async def select_history() -> ViewLog | None:
-    skip, idx, logs = -ITEM_COUNT, -1, list[ViewLog]()
+def turn_page(
+    pages: list[ViewLogRow | None], logs: list[ViewLogRow], idx: int
+) -> int | None:
+    """
+    The index within the shown page, clamped to its items, or None when the
+    cursor of another page is pushed or popped and that page is to be fetched.
+    """
 
-    def within_range(idx: int) -> bool:
-        return 0 <= idx < min(len(logs), ITEM_COUNT)
+    count = min(len(logs), ITEM_COUNT)
+    if pages and 0 <= idx < count:
+        return idx
+    if not pages:
+        pages.append(None)
+    elif idx >= 0 and len(logs) > ITEM_COUNT:
+        pages.append(logs[ITEM_COUNT - 1])
+    elif idx < 0 and len(pages) > 1:
+        pages.pop()
+    else:
+        return min(max(idx, 0), max(count - 1, 0))
+    return None
+
+
+async def select_history() -> ViewLogRow | None:
+    pages, idx, logs = list[ViewLogRow | None](), -1, list[ViewLogRow]()
 
     with CursorAwareWindow() as win, InputScope() as key_src:
-        for key in chain([...], key_src.input()):
+        key: InputEvent | EllipsisType = ...
+        while True:
             match key:
                 case keys.ENTER | keys.SPACE:
                     break
-                case keys.DOWN if within_range(idx + 1) or len(logs) > ITEM_COUNT:
+                case keys.DOWN:
                     idx += 1
                 case keys.UP:
                     idx -= 1
-                case keys.PAGEDOWN if len(logs) > ITEM_COUNT:
+                case keys.PAGEDOWN:
                     idx += ITEM_COUNT
                 case keys.PAGEUP:
                     idx -= ITEM_COUNT
@@ -43,11 +69,13 @@ async def select_history() -> ViewLog | None:
                     return None
                 case SigIntEvent():
                     exit(0)
-            if not within_range(idx):
-                skip = max(0, skip - ITEM_COUNT) if idx < 0 else skip + ITEM_COUNT
-                logs = await repo.list_view_logs(ITEM_COUNT + 1, skip)
-                idx = 0
+            turned = turn_page(pages, logs, idx)
+            if turned is None:
+                logs = await repo.list_view_logs(ITEM_COUNT + 1, pages[-1])
+                turned = 0
+            idx = turned
             lines = render_logs(logs[:ITEM_COUNT], idx)
             win.render_to_terminal(lines)
+            key = await key_src.next_event()
 
     return logs[idx] if 0 <= idx < len(logs) else None
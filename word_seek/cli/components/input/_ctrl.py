@@ -16,6 +16,7 @@ from ....eventsrc.input import (
     keys,
 )
 from ....rxutil import till_complete_async
+from ...frames import Frame, FrameScheduler
 
 from . import _rendering as rendering
 from ._models import SUGGEST_ROWS, InputState
@@ -80,20 +81,24 @@ def apply_completion(state: InputState, found: FoundPhrases) -> None:
     state.suggestions = found.suggestions
 
 
-def render(win: CursorAwareWindow, state: InputState) -> None:
+def compose(state: InputState) -> Frame:
     size = os.get_terminal_size()
-    win.render_to_terminal(rendering.fmt_input(state, size), (0, state.cursor_index))
+    return rendering.fmt_input(state, size), (0, state.cursor_index)
 
 
 async def input() -> str:
-    with CursorAwareWindow(hide_cursor=False) as win, InputScope() as input_src:
-        state = InputState()
+    state = InputState()
+    with (
+        CursorAwareWindow(hide_cursor=False) as win,
+        InputScope() as input_src,
+        FrameScheduler(win, partial(compose, state)) as frames,
+    ):
         suggest_source = rx.Subject[PhrasesQuery]()
         main_pipeline = input_src.observable().pipe(
             op.do_action(partial(consume_key, state)),
             op.take_while(is_not_end),
             op.map(lambda _: state),
-            op.do_action(partial(render, win)),
+            op.do_action(lambda _: frames.request()),
             op.map(to_phase_query),
             op.do_action(
                 on_next=suggest_source.on_next,
@@ -103,8 +108,7 @@ async def input() -> str:
         )
         suggest_pipeline = create_autocomplete(suggest_source).pipe(
             op.do_action(partial(apply_completion, state)),
-            op.map(lambda _: state),
-            op.do_action(partial(render, win)),
+            op.do_action(lambda _: frames.request()),
             op.ignore_elements(),
         )
         await asyncio.gather(
@@ -1,4 +1,5 @@
 import math
+from functools import lru_cache
 from os import terminal_size
 
 from curtsies import fmtfuncs as fmt
@@ -37,28 +38,37 @@ def highlighted_selection(text: str, value: str) -> FmtStr | str:
 
 def measure_columns(
     suggestions: list[str], term: terminal_size
-) -> list[tuple[list[str], int]]:
+) -> tuple[tuple[tuple[str, ...], int], ...]:
+    return _measure_columns(tuple(suggestions), term.columns)
+
+
+# Completions often repeat the previous list, e.g. while the selection moves.
+# The result is shared by the callers, so it is immutable.
+@lru_cache(maxsize=8)
+def _measure_columns(
+    suggestions: tuple[str, ...], term_columns: int
+) -> tuple[tuple[tuple[str, ...], int], ...]:
     PAD = len("  ")
     BAR = len("│")
-    columns = list(collections.chunks(suggestions, SUGGEST_ROWS))
+    columns = [tuple(c) for c in collections.chunks(suggestions, SUGGEST_ROWS)]
     widths = list(max(map(len, c)) + PAD for c in columns)
 
     total_width = 2 * BAR
     for i, width in enumerate(widths):
         new_width = total_width + width
-        if new_width > term.columns:
+        if new_width > term_columns:
             columns = columns[:i]
             widths = widths[:i]
             break
         total_width = new_width
 
-    padding = int(math.floor((term.columns - total_width) / len(widths)))
-    last_padding = term.columns - total_width - padding * (len(columns) - 1)
+    padding = int(math.floor((term_columns - total_width) / len(widths)))
+    last_padding = term_columns - total_width - padding * (len(columns) - 1)
     for i in range(len(widths) - 1):
         widths[i] += padding
     widths[-1] += last_padding
 
-    return list(zip(columns, widths))
+    return tuple(zip(columns, widths))
 
 
 def fmt_suggestions(state: InputState, term: terminal_size) -> list[FmtStr]:
@@ -1,62 +1,150 @@
-import asyncio
 import os
+from collections.abc import Iterator
 
 from curtsies import fmtfuncs as fmt
-from curtsies.formatstring import FmtStr, fmtstr
-from curtsies.window import CursorAwareWindow
+from curtsies.formatstring import fmtstr
+from curtsies.window import FullscreenWindow
 
-from ....db.models import Article, ArticleFormat
-from ....eventsrc.input import InputScope, KeyEvent, SigIntEvent, keys
-from ...formats.xdxf import render_xdxf_lines
+from ....db.models import ArticleRow
+from ....eventsrc.input import (
+    InputEvent,
+    InputScope,
+    KeyEvent,
+    PasteEvent,
+    SigIntEvent,
+    keys,
+)
+from ...formats.articles import fmt_title, iter_article_lines
+from ._models import ArticleLine, LineBuffer, PagerState
+from ._rendering import fmt_viewport, page_height
 
-LINES_PAUSE = 0.2
 
-
-def render_article_lines(articles: list[Article]) -> list[FmtStr]:
+def render_article_lines(articles: list[ArticleRow]) -> Iterator[ArticleLine]:
     if not articles:
-        lines = [fmt.red("No phrases are found.")]
+        yield fmt.red("No phrases are found."), False
     else:
-        lines = [fmtstr(f"Found {len(articles)} result(s):")]
+        yield fmtstr(f"Found {len(articles)} result(s):"), False
     for a in articles:
-        lines.append(fmtstr(""))
-        lines.append(fmtstr(a.dictionary.title, fg="yellow", style="underline"))
-        if a.dtype == ArticleFormat.XDXF:
-            for line in render_xdxf_lines(a.text):
-                lines.append(line)
-        else:
-            for text_line in a.text.rstrip().splitlines():
-                lines.append(fmtstr(text_line))
+        yield fmtstr(""), False
+        yield fmt_title(a), True
+        for line in iter_article_lines(a):
+            yield line, False
+
+
+def scroll_to(state: PagerState, buffer: LineBuffer, top: int, height: int) -> None:
+    buffer.ensure(top + height)
+    state.top = max(0, min(top, len(buffer) - height))
+
+
+def search(state: PagerState, buffer: LineBuffer, height: int, backward: bool) -> None:
+    if not state.query:
+        return
+    found = buffer.find(state.query, state.top, backward)
+    if found is None:
+        state.message = f"Not found: {state.query}"
+    else:
+        scroll_to(state, buffer, found, height)
 
-    return lines
 
+def consume_key_when_prompt(
+    state: PagerState, buffer: LineBuffer, key: InputEvent, height: int
+) -> None:
+    prompt = state.prompt or ""
+    match key:
+        case keys.ESC:
+            state.prompt = None
+        case keys.ENTER:
+            state.prompt, state.query = None, prompt or state.query
+            search(state, buffer, height, backward=False)
+        case keys.BACKSPACE:
+            state.prompt = prompt[:-1]
+        case keys.SPACE:
+            state.prompt = prompt + " "
+        case PasteEvent():
+            state.prompt = prompt + key.text()
+        case KeyEvent() if key.char:
+            state.prompt = prompt + key.char
 
-async def print_lines(lines: list[FmtStr]) -> None:
-    pause = LINES_PAUSE / max(1, len(lines))
-    for line in lines:
-        print(line)
-        await asyncio.sleep(pause)
 
+def consume_key_when_scroll(
+    state: PagerState, buffer: LineBuffer, key: InputEvent, height: int
+) -> None:
+    match key:
+        case KeyEvent("q") | KeyEvent("Q") | keys.ESC:
+            state.exited = True
+        case keys.UP | KeyEvent("k"):
+            scroll_to(state, buffer, state.top - 1, height)
+        case keys.DOWN | KeyEvent("j") | keys.ENTER:
+            scroll_to(state, buffer, state.top + 1, height)
+        case keys.PAGEUP | KeyEvent("b"):
+            scroll_to(state, buffer, state.top - height, height)
+        case keys.PAGEDOWN | keys.SPACE | KeyEvent("f"):
+            scroll_to(state, buffer, state.top + height, height)
+        case keys.HOME | KeyEvent("g"):
+            scroll_to(state, buffer, 0, height)
+        case keys.END | KeyEvent("G"):
+            scroll_to(state, buffer, buffer.ensure(), height)
+        case keys.TAB | KeyEvent("]"):
+            section = buffer.next_section(state.top)
+            if section is not None:
+                scroll_to(state, buffer, section, height)
+        case keys.SHIFT_TAB | KeyEvent("["):
+            section = buffer.prev_section(state.top)
+            if section is not None:
+                scroll_to(state, buffer, section, height)
+        case KeyEvent("/"):
+            state.prompt = ""
+        case KeyEvent("n"):
+            search(state, buffer, height, backward=False)
+        case KeyEvent("N"):
+            search(state, buffer, height, backward=True)
 
-async def view(articles: list[Article]) -> None:
-    lines = render_article_lines(articles)
+
+def consume_key(
+    state: PagerState, buffer: LineBuffer, key: InputEvent, height: int
+) -> None:
+    state.message = ""
+    if state.is_prompt():
+        consume_key_when_prompt(state, buffer, key, height)
+    else:
+        consume_key_when_scroll(state, buffer, key, height)
+
+
+def rewrap(
+    buffer: LineBuffer, articles: list[ArticleRow], top: int, width: int
+) -> tuple[LineBuffer, int]:
+    """Wrap the lines to a new width, keeping the top line in place."""
+
+    if width == buffer.width:
+        return buffer, top
+    line = buffer.line_of(top)
+    buffer = LineBuffer(render_article_lines(articles), width)
+    return buffer, buffer.row_of(line)
+
+
+async def view(articles: list[ArticleRow]) -> None:
     term = os.get_terminal_size()
-    scroll_size = term.lines // 2
-
-    await print_lines(lines[:scroll_size])
-    rest = lines[scroll_size:]
-
-    while rest:
-        with CursorAwareWindow(), InputScope() as key_src:
-            key = next(key_src.input())
-        match key:
-            case keys.ENTER | keys.SPACE:
-                await print_lines(rest[:scroll_size])
-                rest = rest[scroll_size:]
-            case keys.DOWN:
-                await print_lines(rest[:1])
-                rest = rest[1:]
-            case KeyEvent("q") | KeyEvent("Q") | None:
+    buffer = LineBuffer(render_article_lines(articles), term.columns)
+
+    # Short results stay in the scrollback, like a plain print.
+    if buffer.ensure(term.lines) < term.lines and buffer.exhausted:
+        print("\n".join(str(row) for row in buffer.rows))
+        return
+
+    state = PagerState()
+    with FullscreenWindow() as win, InputScope() as key_src:
+        key: InputEvent | None = None
+        while True:
+            term = os.get_terminal_size()
+            buffer, state.top = rewrap(buffer, articles, state.top, term.columns)
+            match key:
+                case SigIntEvent():
+                    exit(0)
+                case None:
+                    pass
+                case _:
+                    consume_key(state, buffer, key, page_height(term))
+            if state.exited:
                 break
-            case SigIntEvent():
-                exit(0)
-    print()
+            win.render_to_terminal(fmt_viewport(state, buffer, term))
+            key = await key_src.next_event()
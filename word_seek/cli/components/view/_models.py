@@ -0,0 +1,116 @@
+import sys
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from curtsies.formatstring import FmtStr
+
+# a rendered line and whether it is the title of a dictionary
+type ArticleLine = tuple[FmtStr, bool]
+
+
+@dataclass
+class PagerState:
+    top: int = 0
+    prompt: str | None = None
+    query: str = ""
+    message: str = ""
+    exited: bool = False
+
+    def is_prompt(self) -> bool:
+        return self.prompt is not None
+
+
+def wrap_line(line: FmtStr, width: int) -> list[FmtStr]:
+    if width < 2 or line.width <= width:
+        return [line]
+    try:
+        return list(line.width_aware_splitlines(width))
+    except ValueError:
+        return [line[i : i + width] for i in range(0, len(line), width)]
+
+
+class LineBuffer:
+    """
+    Indexed display rows: article lines wrapped to the terminal width.
+
+    Lines are rendered from the source only when a row past the buffered ones is
+    needed, so the cost of a jump is proportional to the distance.
+    """
+
+    def __init__(self, lines: Iterator[ArticleLine], width: int) -> None:
+        self.width = width
+        self.rows = list[FmtStr]()
+        self.exhausted = False
+        self._lines = lines
+        self._line_rows = list[int]()
+        self._texts = list[str]()
+        self._sections = list[int]()
+        self._titles = list[str]()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def ensure(self, count: int = sys.maxsize) -> int:
+        while len(self.rows) < count and self._read_line():
+            pass
+        return len(self.rows)
+
+    def line_of(self, row: int) -> int:
+        return max(0, bisect_right(self._line_rows, row) - 1)
+
+    def row_of(self, line: int) -> int:
+        while len(self._line_rows) <= line and self._read_line():
+            pass
+        if not self._line_rows:
+            return 0
+        return self._line_rows[min(line, len(self._line_rows) - 1)]
+
+    def title_of(self, row: int) -> str:
+        idx = bisect_right(self._sections, row) - 1
+        return self._titles[idx] if idx >= 0 else ""
+
+    def next_section(self, row: int) -> int | None:
+        idx = bisect_right(self._sections, row)
+        while idx >= len(self._sections) and self._read_line():
+            pass
+        return self._sections[idx] if idx < len(self._sections) else None
+
+    def prev_section(self, row: int) -> int | None:
+        idx = bisect_left(self._sections, row) - 1
+        return self._sections[idx] if idx >= 0 else None
+
+    def find(self, text: str, row: int, backward: bool = False) -> int | None:
+        """First row of the nearest line after or before ``row`` with the text."""
+
+        needle = text.casefold()
+        line = self.line_of(row)
+        if backward:
+            for idx in range(line - 1, -1, -1):
+                if needle in self._texts[idx]:
+                    return self._line_rows[idx]
+            return None
+
+        idx = line + 1
+        while True:
+            while idx >= len(self._texts):
+                if not self._read_line():
+                    return None
+            if needle in self._texts[idx]:
+                return self._line_rows[idx]
+            idx += 1
+
+    def _read_line(self) -> bool:
+        item = next(self._lines, None)
+        if item is None:
+            self.exhausted = True
+            return False
+
+        line, title = item
+        if title:
+            self._sections.append(len(self.rows))
+            self._titles.append(line.s)
+        self._line_rows.append(len(self.rows))
+        self._texts.append(line.s.casefold())
+        self.rows.extend(wrap_line(line, self.width))
+        return True
@@ -0,0 +1,38 @@
+from os import terminal_size
+
+from curtsies import fmtfuncs as fmt
+from curtsies.formatstring import FmtStr, fmtstr
+
+from ._models import LineBuffer, PagerState
+
+HELP = "↑↓ PgUp PgDn  Tab/S-Tab: dictionary  /: search  n/N: next/prev  q: quit"
+
+
+def page_height(term: terminal_size) -> int:
+    return max(1, term.lines - 1)
+
+
+def fmt_viewport(
+    state: PagerState, buffer: LineBuffer, term: terminal_size
+) -> list[FmtStr]:
+    """Render the visible rows and the status line below them"""
+
+    height = page_height(term)
+    buffer.ensure(state.top + height)
+    rows = buffer.rows[state.top : state.top + height]
+    padding = [fmtstr("")] * (height - len(rows))
+    return [*rows, *padding, fmt_status(state, buffer, term)]
+
+
+def fmt_status(state: PagerState, buffer: LineBuffer, term: terminal_size) -> FmtStr:
+    if state.prompt is not None:
+        return fmtstr("/" + state.prompt)[: term.columns - 1]
+
+    bottom = min(len(buffer), state.top + page_height(term))
+    total = f"{len(buffer)}" if buffer.exhausted else f"{len(buffer)}+"
+    position = f" {state.top + 1}-{bottom}/{total} "
+    title = buffer.title_of(state.top)
+    message = state.message or HELP
+    left = f"{position}{title}  "[: term.columns]
+    right = message[: term.columns - len(left)].rjust(term.columns - len(left))
+    return fmt.invert(left) + fmt.gray(right)
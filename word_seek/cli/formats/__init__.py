@@ -0,0 +1,16 @@
+import sys
+from enum import StrEnum
+
+
+class OutputFormat(StrEnum):
+    """How a command prints to stdout; auto is ansi on a terminal, else plain"""
+
+    AUTO = "auto"
+    PLAIN = "plain"
+    ANSI = "ansi"
+    JSON = "json"
+
+    def resolve(self) -> "OutputFormat":
+        if self != OutputFormat.AUTO:
+            return self
+        return OutputFormat.ANSI if sys.stdout.isatty() else OutputFormat.PLAIN
@@ -0,0 +1,25 @@
+from collections.abc import Iterator
+
+from curtsies.formatstring import FmtStr, fmtstr
+
+from ...db.models import ArticleFormat, ArticleRow
+from .xdxf import iter_xdxf_lines, iter_xdxf_text
+
+
+def fmt_title(article: ArticleRow) -> FmtStr:
+    return fmtstr(article.dictionary.title, fg="yellow", style="underline")
+
+
+def iter_article_lines(article: ArticleRow) -> Iterator[FmtStr]:
+    if article.dtype == ArticleFormat.XDXF:
+        yield from iter_xdxf_lines(article.text, article.tokens)
+    else:
+        for text_line in article.text.rstrip().splitlines():
+            yield fmtstr(text_line)
+
+
+def iter_article_text(article: ArticleRow) -> Iterator[str]:
+    if article.dtype == ArticleFormat.XDXF:
+        yield from iter_xdxf_text(article.text, article.tokens)
+    else:
+        yield from article.text.rstrip().splitlines()
@@ -1,12 +1,14 @@
 import logging
+from abc import ABC, abstractmethod
 from collections import deque
-from collections.abc import Mapping
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
 from typing import Any
 
 from curtsies.formatstring import FmtStr, fmtstr
 from webcolors import IntegerRGB, hex_to_rgb, name_to_rgb
 
-from ...formats.visitor import XmlNodeVisitor
+from ...formats.tokens import TokenStream, compile_xdxf, loads
 
 logger = logging.getLogger()
 
@@ -47,74 +49,170 @@ STYLES: dict[str, dict[str, Any]] = {
 }
 
 
-def render_xdxf_lines(content: str) -> list[FmtStr]:
-    try:
-        visitor = XdxfVisitor()
-        visitor.visit(f"<root>{content}</root>")
-        return visitor.lines
-    except Exception as exc:
-        logger.error("XDXF display error", exc)
-        return [fmtstr(content)]
+def render_xdxf_lines(content: str, tokens: str | None = None) -> list[FmtStr]:
+    return list(iter_xdxf_lines(content, tokens))
 
 
-class XdxfVisitor(XmlNodeVisitor):
-    def __init__(self, lines: list[FmtStr] | None = None) -> None:
-        super().__init__()
+def iter_xdxf_lines(content: str, tokens: str | None = None) -> Iterator[FmtStr]:
+    """Render lines one at a time, doing only the work needed for each."""
 
-        self.lines = list[FmtStr]() if lines is None else lines
-        self.cur = FmtStr()
-        self.blockquotes = 0
-        self.styles = deque[dict[str, Any]]()
+    return _walk_lines(XdxfLines, fmtstr, content, tokens)
 
-    def visit_tag(self, tag: str, attrs: Mapping[str, str]) -> None:
-        style = STYLES.get(tag) or {}
-        combined = self.styles[-1].copy() if self.styles else {}
-        combined.update(style)
-        self.styles.append(combined)
 
+def iter_xdxf_text(content: str, tokens: str | None = None) -> Iterator[str]:
+    """The lines of ``iter_xdxf_lines`` as plain text, without building styles."""
+
+    return _walk_lines(XdxfText, str, content, tokens)
+
+
+@dataclass(slots=True)
+class _OpenTag:
+    name: str
+    attrs: Mapping[str, str]
+    end: int
+
+
+class XdxfWalk[L: (str, FmtStr)](ABC):
+    """
+    Lines of a token stream, walked without recursion so it can pause.
+
+    The walk decides where lines break and what text they hold; subclasses make
+    the line segments and may style them by the open tags.
+    """
+
+    def __init__(self, stream: TokenStream) -> None:
+        self.stream = stream
+        self.ready: deque[L] = deque()
+        self.cur: L = self.blank()
+        self.blockquotes = 0
+        self.opened = deque[_OpenTag]()
+
+    @abstractmethod
+    def blank(self) -> L: ...
+
+    @abstractmethod
+    def segment(self, text: str, outer: bool = False) -> L:
+        """The text styled by the innermost open tag, or its parent if outer"""
+
+    def push_style(self, tag: str, attrs: Mapping[str, str]) -> None:
+        pass
+
+    def pop_style(self) -> None:
+        pass
+
+    def __iter__(self) -> Iterator[L]:
+        ops, idx = self.stream.ops, 0
+        while idx < len(ops):
+            op = ops[idx]
+            if isinstance(op, str):
+                self.visit_text(op)
+                idx += 1
+            elif op is None:
+                self.leave_tag(self.opened.pop())
+                idx += 1
+            else:
+                idx = self.enter_tag(idx)
+            while self.ready:
+                yield self.ready.popleft()
+        if self.cur and not self.cur.isspace():
+            yield self.cur
+
+    def enter_tag(self, idx: int) -> int:
+        tag, attrs = self.stream.open_tag(idx)
+        end = self.stream.ends[idx]
         match tag:
-            case "c":
-                if "c" in attrs:
-                    try:
-                        deltas = [(c, rgba_delta(c, attrs["c"])) for c in COLORS]
-                        deltas.sort(key=lambda x: x[1])
-                        color, _ = deltas[0]
-                        combined["fg"] = color
-                    except Exception:
-                        pass
-                super().visit_tag(tag, attrs)
             case "rref":
-                pass
-            case "iref":
-                super().visit_tag(tag, attrs)
-                if "href" in attrs:
-                    self.visit_text(" ➤ ")
-                    self.visit_text(attrs["href"])
+                return end + 1
             case "blockquote":
                 self.blockquotes += 1
                 if self.cur and not self.cur.isspace():
-                    self.lines.append(self.cur)
-                self.cur = fmtstr("")
-                super().visit_tag(tag, attrs)
-                self.blockquotes -= 1
-            case _:
-                super().visit_tag(tag, attrs)
+                    self.ready.append(self.cur)
+                self.cur = self.blank()
 
-        self.styles.pop()
+        self.push_style(tag, attrs)
+        self.opened.append(_OpenTag(tag, attrs, end))
+        return idx + 1
+
+    def leave_tag(self, tag: _OpenTag) -> None:
+        match tag.name:
+            case "iref":
+                if "href" in tag.attrs:
+                    self.visit_text(" ➤ ")
+                    self.visit_text(tag.attrs["href"])
+            case "blockquote":
+                self.blockquotes -= 1
+        self.pop_style()
 
     def visit_text(self, text: str) -> None:
         lines = text.split("\n")
-        style = self.styles[-1].copy() if self.styles else {}
-        prev_style = self.styles[-2].copy() if len(self.styles) > 1 else {}
-        prefix = fmtstr(
-            " " * self.blockquotes if self.blockquotes else "", **prev_style
-        )
+        prefix = self.segment(" " * self.blockquotes, outer=True)
         if self.cur:
-            self.cur += fmtstr(lines[0], **style)
+            self.cur += self.segment(lines[0])
         else:
-            self.cur += prefix + fmtstr(lines[0], **style)
+            self.cur += prefix + self.segment(lines[0])
         if len(lines) > 1:
-            self.lines.append(self.cur)
+            self.ready.append(self.cur)
             for line in lines[1:-1]:
-                self.lines.append(prefix + fmtstr(line, **style))
-            self.cur = prefix + fmtstr(lines[-1], **style)
+                self.ready.append(prefix + self.segment(line))
+            self.cur = prefix + self.segment(lines[-1])
+
+
+class XdxfLines(XdxfWalk[FmtStr]):
+    def __init__(self, stream: TokenStream) -> None:
+        self.styles = deque[dict[str, Any]]()
+        super().__init__(stream)
+
+    def blank(self) -> FmtStr:
+        return FmtStr()
+
+    def segment(self, text: str, outer: bool = False) -> FmtStr:
+        depth = 2 if outer else 1
+        style = self.styles[-depth] if len(self.styles) >= depth else {}
+        return fmtstr(text, **style)
+
+    def push_style(self, tag: str, attrs: Mapping[str, str]) -> None:
+        combined = self.styles[-1].copy() if self.styles else {}
+        combined.update(STYLES.get(tag) or {})
+        if tag == "c" and "c" in attrs:
+            try:
+                deltas = [(c, rgba_delta(c, attrs["c"])) for c in COLORS]
+                deltas.sort(key=lambda x: x[1])
+                color, _ = deltas[0]
+                combined["fg"] = color
+            except Exception:
+                pass
+        self.styles.append(combined)
+
+    def pop_style(self) -> None:
+        self.styles.pop()
+
+
+class XdxfText(XdxfWalk[str]):
+    """The lines of ``XdxfLines`` as plain text, without building styles."""
+
+    def blank(self) -> str:
+        return ""
+
+    def segment(self, text: str, outer: bool = False) -> str:
+        return text
+
+
+def _walk_lines[L: (str, FmtStr)](
+    walk: type[XdxfWalk[L]],
+    raw: Callable[[str], L],
+    content: str,
+    tokens: str | None,
+) -> Iterator[L]:
+    # The raw content stands in for an article that fails before its first
+    # line; after that the shown lines are kept and the rest is left out, so
+    # that no line is shown twice.
+    shown = False
+    try:
+        stream = (loads(tokens) if tokens else None) or compile_xdxf(content)
+        for line in walk(stream):
+            shown = True
+            yield line
+    except Exception:
+        logger.exception("XDXF display error")
+        if not shown:
+            yield raw(content)
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from types import TracebackType
+from typing import Final
+
+from curtsies.formatstring import FmtStr
+from curtsies.window import BaseWindow
+
+from ..rxutil import call_on_loop
+
+FRAME_INTERVAL: Final = 1 / 30
+
+type Frame = tuple[list[FmtStr], tuple[int, int]]
+
+
+class FrameScheduler(AbstractContextManager["FrameScheduler"]):
+    """
+    Coalesce render requests into at most one frame per interval.
+
+    Requests may come from any thread. Frames are composed and drawn on the event
+    loop, and a frame equal to the previous one is not written at all. A frame
+    still pending on exit is drawn then, so the last keys are shown.
+    """
+
+    def __init__(
+        self,
+        win: BaseWindow,
+        compose: Callable[[], Frame],
+        interval: float = FRAME_INTERVAL,
+    ) -> None:
+        self._win = win
+        self._compose = compose
+        self._interval = interval
+        self._loop = asyncio.get_running_loop()
+        self._lock = threading.Lock()
+        self._pending = False
+        self._closed = False
+        self._handle: asyncio.TimerHandle | None = None
+        self._last_time = -interval
+        self._last_frame: Frame | None = None
+        self.requests = 0
+        self.frames = 0
+
+    def request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            if self._pending or self._closed:
+                return
+            self._pending = True
+        call_on_loop(self._loop, self._schedule)
+
+    def _schedule(self) -> None:
+        if self._closed:
+            return
+        delay = self._last_time + self._interval - self._loop.time()
+        self._handle = self._loop.call_later(max(0.0, delay), self._draw)
+
+    def _draw(self) -> None:
+        with self._lock:
+            self._pending = False
+        self._handle = None
+        self._last_time = self._loop.time()
+
+        frame = self._compose()
+        if frame == self._last_frame:
+            return
+        self._last_frame = frame
+        lines, cursor = frame
+        self._win.render_to_terminal(lines, cursor)
+        self.frames += 1
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+        /,
+    ) -> None:
+        with self._lock:
+            self._closed = True
+            pending = self._pending
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        if pending:
+            self._draw()
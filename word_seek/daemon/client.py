@@ -0,0 +1,46 @@
+import socket
+from os import PathLike
+from typing import Any, Final
+
+from ..db.config import get_socket_path
+from .protocol import FrameError, encode, recv_message
+
+# A live daemon accepts at once, so a slow connect means it is stuck and the
+# caller is better off working in-process.
+CONNECT_TIMEOUT: Final = 0.5
+REPLY_TIMEOUT: Final = 30.0
+
+
+class DaemonUnavailable(Exception):
+    """No daemon answered on the socket."""
+
+
+class DaemonError(Exception):
+    """The daemon failed to serve the request."""
+
+
+def call(request: dict[str, Any], path: PathLike[str] | None = None) -> Any:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(path or get_socket_path()))
+        except OSError as exc:
+            raise DaemonUnavailable(str(exc)) from exc
+
+        sock.settimeout(REPLY_TIMEOUT)
+        try:
+            sock.sendall(encode(request))
+        except OSError as exc:
+            raise DaemonUnavailable(str(exc)) from exc
+        # the whole request is sent, so the daemon may have served it
+        try:
+            reply = recv_message(sock)
+        except (OSError, FrameError) as exc:
+            raise DaemonError(f"No reply: {exc}") from exc
+
+    match reply:
+        case {"ok": True, "result": result}:
+            return result
+        case {"ok": False, "error": str(error)}:
+            raise DaemonError(error)
+    raise DaemonError(f"Malformed reply: {reply!r}")
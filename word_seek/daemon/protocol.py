@@ -0,0 +1,75 @@
+"""
+Framed messages between the daemon and its clients.
+
+A frame is the length of its payload as 4 bytes, big-endian, then the payload:
+a message as compact UTF-8 JSON. A request is an object with an ``op`` and its
+arguments; the reply is ``{"ok": true, "result": ...}`` or
+``{"ok": false, "error": "..."}``. A connection may carry many requests, each
+one answered before the next is read.
+"""
+
+import asyncio
+import json
+import socket
+import struct
+from typing import Any, Final
+
+HEADER: Final = struct.Struct(">I")
+MAX_FRAME: Final = 16 * 1024 * 1024
+
+
+class FrameError(Exception):
+    pass
+
+
+def encode(message: Any) -> bytes:
+    payload = json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode()
+    if len(payload) > MAX_FRAME:
+        raise FrameError(f"Message of {len(payload)} bytes is too long")
+    return HEADER.pack(len(payload)) + payload
+
+
+def decode(payload: bytes) -> Any:
+    try:
+        return json.loads(payload)
+    except ValueError as exc:
+        raise FrameError("Malformed message") from exc
+
+
+def _payload_size(header: bytes) -> int:
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME:
+        raise FrameError(f"Frame of {size} bytes is too long")
+    return size
+
+
+async def read_message(reader: asyncio.StreamReader) -> Any | None:
+    """The next message of the stream, or None when it ends between frames."""
+
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as exc:
+        if not exc.partial:
+            return None
+        raise FrameError("Truncated frame") from exc
+    try:
+        payload = await reader.readexactly(_payload_size(header))
+    except asyncio.IncompleteReadError as exc:
+        raise FrameError("Truncated frame") from exc
+    return decode(payload)
+
+
+def recv_message(sock: socket.socket) -> Any:
+    header = _recv_exactly(sock, HEADER.size)
+    return decode(_recv_exactly(sock, _payload_size(header)))
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks, left = list[bytes](), size
+    while left:
+        chunk = sock.recv(min(left, 1024 * 1024))
+        if not chunk:
+            raise FrameError("Truncated frame")
+        chunks.append(chunk)
+        left -= len(chunk)
+    return b"".join(chunks)
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import os
+import signal
+from functools import partial
+from os import PathLike
+from typing import Any
+
+from ..cli.commands.lookup import format_lookup
+from ..cli.formats import OutputFormat
+from ..db import repo
+from ..eventsrc import autocomplete
+from ..eventsrc.autocomplete import PhrasesQuery
+from ..index import headwords
+from .client import DaemonUnavailable, call
+from .protocol import FrameError, encode, read_message
+
+logger = logging.getLogger()
+
+
+class DaemonRunning(Exception):
+    """Another daemon already listens on the socket."""
+
+
+async def dispatch(request: Any) -> Any:
+    match request:
+        case {"op": "ping"}:
+            return os.getpid()
+        case {"op": "lookup", "phrase": str(phrase), "output": str(output)}:
+            found = await repo.lookup(
+                phrase,
+                exact=bool(request.get("exact")),
+                log_view=bool(request.get("log_view")),
+            )
+            return format_lookup(found, OutputFormat(output)) if found else None
+        case {"op": "suggest", "phrase": str(phrase), "limit": int(limit)}:
+            # reopened only when a rebuild replaced the file
+            await headwords.load()
+            query = PhrasesQuery(phrase, limit)
+            return (await autocomplete.find_phrases(query)).suggestions
+    raise ValueError(f"Unknown request: {request!r}")
+
+
+async def _serve_client(
+    clients: set[asyncio.StreamWriter],
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    clients.add(writer)
+    try:
+        while (request := await read_message(reader)) is not None:
+            try:
+                reply = {"ok": True, "result": await dispatch(request)}
+            except Exception as exc:
+                logger.exception("Request failed: %r", request)
+                reply = {"ok": False, "error": str(exc)}
+            writer.write(encode(reply))
+            await writer.drain()
+    except (ConnectionError, FrameError) as exc:
+        logger.warning("Client dropped: %s", exc)
+    finally:
+        clients.discard(writer)
+        writer.close()
+
+
+def _claim_socket(path: PathLike[str]) -> None:
+    """Remove the socket a crashed daemon left, unless a daemon still answers."""
+
+    try:
+        call({"op": "ping"}, path)
+    except DaemonUnavailable:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    raise DaemonRunning(f"A daemon already listens on {os.fspath(path)}")
+
+
+async def warm_up() -> None:
+    """Pay once what a cold CLI run pays for: the imports, the engines with
+    their connections, the headwords and the suggestion cache."""
+
+    await repo.get_content_generation()
+    await headwords.load()
+    await autocomplete.load_cache()
+
+
+async def cool_down() -> None:
+    await autocomplete.save_cache()
+
+
+async def wait_for_stop() -> None:
+    """Return on SIGINT or SIGTERM."""
+
+    loop = asyncio.get_running_loop()
+    stopped = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+    try:
+        await stopped.wait()
+    finally:
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(signum)
+
+
+async def serve(path: PathLike[str]) -> None:
+    """Serve requests on the Unix socket until SIGINT or SIGTERM."""
+
+    _claim_socket(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    await warm_up()
+
+    clients = set[asyncio.StreamWriter]()
+    handler = partial(_serve_client, clients)
+    # the socket is created private rather than opened up until a chmod
+    umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(handler, path=os.fspath(path))
+    finally:
+        os.umask(umask)
+    try:
+        async with server:
+            await wait_for_stop()
+            # the server waits for its connections to end before it closes
+            server.close()
+            for writer in list(clients):
+                writer.close()
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+        await cool_down()
@@ -0,0 +1,464 @@
+"""
+A JSON service over HTTP/1.1 on localhost, for editors and browser extensions
+that cannot speak the daemon's framed socket protocol.
+
+    GET /suggest?q=PHRASE&limit=20
+    GET /lookup?q=PHRASE&exact=1
+    GET /history?limit=16&before=CURSOR
+    GET /dicts
+    GET /metrics
+
+Lookups and the dictionary list carry the content generation as their ETag, so
+a client revalidates with If-None-Match and gets 304 until an import or a new
+dictionary order changes the data. Suggestions also rank phrases by how often
+they were viewed, which the generation does not follow, so they are only cached
+for a minute. Large bodies are gzipped when the client accepts it, so the tags
+are weak: both encodings of a body share one.
+
+Only requests to a local Host are served: a page whose own domain was rebound
+to 127.0.0.1 still names that domain, and is turned away.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any, Final
+from urllib.parse import parse_qsl, urlsplit
+
+from ..cli.commands.lookup import article_json
+from ..db import repo
+from ..db.exec import READ_POOL_SIZE
+from ..db.models import PhraseRow, ViewLogRow
+from ..eventsrc import autocomplete
+from ..eventsrc.autocomplete import PhrasesQuery
+from ..index import headwords
+from .server import cool_down, wait_for_stop, warm_up
+
+logger = logging.getLogger()
+
+HOST: Final = "127.0.0.1"
+LOCAL_HOSTS: Final = frozenset({"127.0.0.1", "localhost"})
+DEFAULT_PORT: Final = 8765
+
+# Requests served at once, a pair per reader, and requests queued behind them;
+# the rest are turned away with 503 rather than left to time out.
+MAX_CONCURRENT: Final = 2 * READ_POOL_SIZE
+MAX_WAITING: Final = 64
+RETRY_AFTER: Final = 1
+
+MAX_HEAD: Final = 16 * 1024
+IDLE_TIMEOUT: Final = 30.0
+MAX_LIMIT: Final = 100
+GZIP_MIN_SIZE: Final = 1024
+GZIP_LEVEL: Final = 5
+LATENCY_SAMPLES: Final = 1024
+
+CURSOR_FORMAT: Final = "%Y%m%dT%H%M%S%f"
+
+
+class HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str | None = None) -> None:
+        super().__init__(message or status.phrase)
+        self.status = status
+        self.message = message or status.phrase
+
+
+@dataclass(slots=True)
+class Request:
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]
+    keep_alive: bool
+
+    def accepts_gzip(self) -> bool:
+        for coding in self.headers.get("accept-encoding", "").split(","):
+            name, _, params = coding.partition(";")
+            if name.strip().lower() in ("gzip", "*"):
+                return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+        return False
+
+
+@dataclass(slots=True)
+class Response:
+    status: HTTPStatus
+    body: Any = None
+    cache_control: str = "no-store"
+    etag: str | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+type Handler = Callable[[Request], Awaitable[Response]]
+
+
+@dataclass(slots=True, frozen=True)
+class Endpoint:
+    handler: Handler
+    # the response is tagged with the content generation
+    tagged: bool = False
+    # the request takes a slot of the concurrency limit
+    limited: bool = True
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    requests: int = 0
+    not_modified: int = 0
+    client_errors: int = 0
+    server_errors: int = 0
+    rejected: int = 0
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=LATENCY_SAMPLES)
+    )
+
+    def record(self, status: HTTPStatus, elapsed: float) -> None:
+        self.requests += 1
+        self.latencies.append(elapsed)
+        if status == HTTPStatus.NOT_MODIFIED:
+            self.not_modified += 1
+        elif status == HTTPStatus.SERVICE_UNAVAILABLE:
+            self.rejected += 1
+        elif status >= 500:
+            self.server_errors += 1
+        elif status >= 400:
+            self.client_errors += 1
+
+    def summary(self) -> dict[str, Any]:
+        samples = sorted(self.latencies)
+
+        def percentile(p: float) -> float | None:
+            if not samples:
+                return None
+            return round(samples[int(p * (len(samples) - 1))] * 1000, 3)
+
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "client_errors": self.client_errors,
+            "server_errors": self.server_errors,
+            "rejected": self.rejected,
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": percentile(1),
+            },
+        }
+
+
+def _param(request: Request, name: str) -> str:
+    value = request.query.get(name)
+    if not value:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"Missing parameter: {name}")
+    return value
+
+
+def _int_param(request: Request, name: str, default: int) -> int:
+    value = request.query.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if not 0 < number <= MAX_LIMIT:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"{name} must be from 1 to {MAX_LIMIT}")
+    return number
+
+
+def _flag_param(request: Request, name: str) -> bool:
+    return request.query.get(name, "").lower() in ("1", "true", "yes")
+
+
+async def suggest(request: Request) -> Response:
+    query = PhrasesQuery(_param(request, "q"), _int_param(request, "limit", 20))
+    # reopened only when a rebuild replaced the file
+    await headwords.load()
+    found = await autocomplete.find_phrases(query)
+    body = {
+        "suggestions": found.suggestions,
+        "has_more": found.has_more,
+        "fuzzy": found.fuzzy,
+    }
+    return Response(HTTPStatus.OK, body, cache_control="private, max-age=60")
+
+
+async def lookup(request: Request) -> Response:
+    phrase = _param(request, "q")
+    found = await repo.lookup(
+        phrase, exact=_flag_param(request, "exact"), log_view=False
+    )
+    if found is None:
+        raise HttpError(HTTPStatus.NOT_FOUND, "No phrases are found")
+    articles = [article_json(a) for a in found.articles]
+    return Response(HTTPStatus.OK, {"phrase": found.phrase.text, "articles": articles})
+
+
+def _parse_cursor(cursor: str) -> ViewLogRow:
+    # only the position in the history is kept, the phrase is not
+    shown_at, _, id = cursor.partition("-")
+    try:
+        shown_at_utc = datetime.strptime(shown_at, CURSOR_FORMAT)
+        return ViewLogRow(int(id), 0, PhraseRow(0, ""), shown_at_utc)
+    except ValueError as exc:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed cursor") from exc
+
+
+async def history(request: Request) -> Response:
+    limit = _int_param(request, "limit", 16)
+    cursor = request.query.get("before")
+    before = _parse_cursor(cursor) if cursor else None
+    logs = await repo.list_view_logs(limit, before)
+    items = [
+        {
+            "id": log.id,
+            "phrase": log.phrase.text,
+            "shown_at_utc": log.shown_at_utc.isoformat(),
+        }
+        for log in logs
+    ]
+    next_cursor = None
+    if len(logs) == limit:
+        last = logs[-1]
+        next_cursor = f"{last.shown_at_utc.strftime(CURSOR_FORMAT)}-{last.id}"
+    return Response(HTTPStatus.OK, {"items": items, "next": next_cursor})
+
+
+async def dicts(request: Request) -> Response:
+    items = [
+        {"id": d.id, "title": d.title, "sort_order": d.sort_order}
+        for d in await repo.list_dicts()
+    ]
+    return Response(HTTPStatus.OK, items)
+
+
+ROUTES: Final[Mapping[str, Endpoint]] = {
+    "/suggest": Endpoint(suggest),
+    "/lookup": Endpoint(lookup, tagged=True),
+    "/history": Endpoint(history),
+    "/dicts": Endpoint(dicts, tagged=True),
+}
+
+
+def _error(status: HTTPStatus, message: str | None = None) -> Response:
+    return Response(status, {"error": message or status.phrase})
+
+
+def _is_local(host: str) -> bool:
+    name, sep, port = host.rpartition(":")
+    if not sep or not port.isdigit():
+        name = host
+    return name.lower() in LOCAL_HOSTS
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request | None:
+    """The next request of the connection, or None when it ends between them."""
+
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as exc:
+        if not exc.partial.strip():
+            return None
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Truncated request") from exc
+    except asyncio.LimitOverrunError as exc:
+        raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE) from exc
+
+    request_line, *lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+    try:
+        method, target, version = request_line.split(" ")
+    except ValueError as exc:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line") from exc
+    if version not in ("HTTP/1.0", "HTTP/1.1"):
+        raise HttpError(HTTPStatus.HTTP_VERSION_NOT_SUPPORTED)
+
+    headers = dict[str, str]()
+    for line in lines:
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed header")
+        headers[name.strip().lower()] = value.strip()
+    # no endpoint takes a body, and an unread one would be taken for a request
+    if headers.get("content-length", "0") != "0" or "transfer-encoding" in headers:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Requests take no body")
+    # HTTP/1.0 clients may leave the Host out, browsers never do
+    host = headers.get("host")
+    if host is None and version == "HTTP/1.1":
+        raise HttpError(HTTPStatus.BAD_REQUEST, "No Host header")
+    if host is not None and not _is_local(host):
+        raise HttpError(HTTPStatus.MISDIRECTED_REQUEST, f"Not a local host: {host}")
+
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.1":
+        keep_alive = connection != "close"
+    else:
+        keep_alive = connection == "keep-alive"
+
+    url = urlsplit(target)
+    query = dict(parse_qsl(url.query))
+    return Request(method, url.path, query, headers, keep_alive)
+
+
+def encode_response(
+    response: Response, request: Request | None, keep_alive: bool
+) -> bytes:
+    status = response.status
+    headers = {
+        "Content-Type": "application/json; charset=utf-8",
+        "Cache-Control": response.cache_control,
+        "Vary": "Accept-Encoding",
+        **response.headers,
+    }
+    if response.etag:
+        headers["ETag"] = response.etag
+
+    body = b""
+    if status != HTTPStatus.NOT_MODIFIED:
+        body = json.dumps(
+            response.body, ensure_ascii=False, separators=(",", ":")
+        ).encode()
+        if len(body) >= GZIP_MIN_SIZE and request and request.accepts_gzip():
+            body = gzip.compress(body, GZIP_LEVEL)
+            headers["Content-Encoding"] = "gzip"
+        headers["Content-Length"] = str(len(body))
+    headers["Connection"] = "keep-alive" if keep_alive else "close"
+    if request and request.method == "HEAD":
+        body = b""
+
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+class WebService:
+    def __init__(
+        self,
+        routes: Mapping[str, Endpoint] = ROUTES,
+        max_concurrent: int = MAX_CONCURRENT,
+        max_waiting: int = MAX_WAITING,
+    ) -> None:
+        self.routes = {**routes, "/metrics": Endpoint(self.metrics, limited=False)}
+        self.stats = {path: EndpointStats() for path in self.routes}
+        self.clients = set[asyncio.StreamWriter]()
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._waiting = 0
+        self._max_waiting = max_waiting
+        self._started = time.monotonic()
+
+    async def metrics(self, request: Request) -> Response:
+        body = {
+            "uptime_s": round(time.monotonic() - self._started, 3),
+            "connections": len(self.clients),
+            "waiting": self._waiting,
+            "endpoints": {path: stats.summary() for path, stats in self.stats.items()},
+        }
+        return Response(HTTPStatus.OK, body)
+
+    async def _run(self, endpoint: Endpoint, request: Request) -> Response:
+        if not endpoint.tagged:
+            return await endpoint.handler(request)
+
+        # Read before the handler, so the tag may only be older than the body,
+        # which costs the client a refetch and never a stale 304.
+        etag = f'W/"{await repo.get_content_generation()}"'
+        # If-None-Match compares weakly: W/ is ignored on both sides
+        matches = request.headers.get("if-none-match", "")
+        tags = {tag.strip().removeprefix("W/") for tag in matches.split(",")}
+        if matches == "*" or etag.removeprefix("W/") in tags:
+            response = Response(HTTPStatus.NOT_MODIFIED)
+        else:
+            response = await endpoint.handler(request)
+        response.etag = etag
+        response.cache_control = "no-cache"
+        return response
+
+    async def _run_limited(self, endpoint: Endpoint, request: Request) -> Response:
+        if self._slots.locked() and self._waiting >= self._max_waiting:
+            raise HttpError(HTTPStatus.SERVICE_UNAVAILABLE, "The service is busy")
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            return await self._run(endpoint, request)
+        finally:
+            self._slots.release()
+
+    async def respond(self, request: Request) -> Response:
+        endpoint = self.routes.get(request.path)
+        if endpoint is None:
+            return _error(HTTPStatus.NOT_FOUND, f"No endpoint {request.path}")
+
+        start = time.perf_counter()
+        try:
+            if request.method not in ("GET", "HEAD"):
+                response = _error(HTTPStatus.METHOD_NOT_ALLOWED)
+                response.headers["Allow"] = "GET, HEAD"
+            elif endpoint.limited:
+                response = await self._run_limited(endpoint, request)
+            else:
+                response = await self._run(endpoint, request)
+        except HttpError as exc:
+            response = _error(exc.status, exc.message)
+            if exc.status == HTTPStatus.SERVICE_UNAVAILABLE:
+                response.headers["Retry-After"] = str(RETRY_AFTER)
+        except Exception:
+            logger.exception("Request failed: %s %s", request.method, request.path)
+            response = _error(HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.stats[request.path].record(response.status, time.perf_counter() - start)
+        return response
+
+    async def serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.clients.add(writer)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), IDLE_TIMEOUT)
+                except TimeoutError:
+                    break
+                except HttpError as exc:
+                    # the rest of the stream cannot be trusted to start a request
+                    response = _error(exc.status, exc.message)
+                    writer.write(encode_response(response, None, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                response = await self.respond(request)
+                writer.write(encode_response(response, request, request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except ConnectionError as exc:
+            logger.warning("Client dropped: %s", exc)
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+
+async def serve(port: int = DEFAULT_PORT) -> None:
+    """Serve HTTP on localhost until SIGINT or SIGTERM."""
+
+    await warm_up()
+    service = WebService()
+    server = await asyncio.start_server(
+        service.serve_client, HOST, port, limit=MAX_HEAD
+    )
+    try:
+        async with server:
+            await wait_for_stop()
+            # the server waits for its connections to end before it closes
+            server.close()
+            for writer in list(service.clients):
+                writer.close()
+    finally:
+        await cool_down()
@@ -0,0 +1,16 @@
+from typing import Final
+
+from ..utils.cache import LRUCache
+from .models import ArticleRow
+
+ARTICLES_MAX_BYTES: Final = 16 * 1024 * 1024
+
+
+def _articles_size(articles: list[ArticleRow]) -> int:
+    return sum(
+        len(article.text.encode()) + len((article.tokens or "").encode())
+        for article in articles
+    )
+
+
+articles = LRUCache[int, list[ArticleRow]](ARTICLES_MAX_BYTES, _articles_size)
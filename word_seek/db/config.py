@@ -10,6 +10,19 @@ def get_db_path() -> PurePath:
     return PurePath(user_data_dir(APP_ID, _AUTHOR)).joinpath("database.db")
 
 
+def get_headwords_path() -> PurePath:
+    return get_db_path().with_name("headwords.snapshot")
+
+
+def get_suggestions_path() -> PurePath:
+    return get_db_path().with_name("suggestions.json")
+
+
+def get_socket_path() -> PurePath:
+    # next to the database, so that a daemon serves the data the CLI would open
+    return get_db_path().with_name("daemon.sock")
+
+
 def get_db_connection_url(no_async: bool = False) -> str:
     if no_async:
         return f"sqlite:///{get_db_path()}"
@@ -1,11 +1,14 @@
 from collections.abc import AsyncIterable, Awaitable, Callable
 from functools import wraps
-from typing import Concatenate
+from typing import Concatenate, Final
 
 from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .exec import new_session
+from .exec import interruptible, new_session
+
+# attempts of a writing transaction when the database stays busy
+WRITE_ATTEMPTS: Final = 3
 
 
 class transact[**P, Res]:
@@ -27,6 +30,16 @@ class transact[**P, Res]:
         return self._orig_func(session, *args, **kwargs)
 
 
+class transact_write[**P, Res](transact[P, Res]):
+    """A transaction that writes: run again while the database is busy."""
+
+    def __init__(
+        self, orig_func: Callable[Concatenate[AsyncSession, P], Awaitable[Res]]
+    ) -> None:
+        super().__init__(orig_func)
+        self._tx_func = retry_on_transient(WRITE_ATTEMPTS)(self._tx_func)
+
+
 class transact_iter[**P, Res]:
     def __init__(
         self, orig_func: Callable[Concatenate[AsyncSession, P], AsyncIterable[Res]]
@@ -52,7 +65,7 @@ def _make_transact[**P, Res](
     @wraps(query)
     async def decorated(*args: P.args, **kwargs: P.kwargs) -> Res:
         async with new_session() as session:
-            return await query(session, *args, **kwargs)
+            return await interruptible(session, query(session, *args, **kwargs))
 
     return decorated
 
@@ -1,14 +1,139 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from contextlib import suppress
+from typing import Any, Final
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+from sqlalchemy.sql.dml import UpdateBase
 
 from .config import get_db_connection_url
 from .models import Base
 from .queries import ModifyQuery, Query
 
-engine = create_async_engine(get_db_connection_url(), echo=False, future=True)
+# SQLite allows a single writer at a time, while WAL lets readers go on
+# meanwhile, so the writes queue for one connection and reads have a pool.
+READ_POOL_SIZE: Final = 4
+BUSY_TIMEOUT_MS: Final = 5000
+WRITER_PRAGMAS: Final = (
+    "journal_mode = WAL",
+    "synchronous = NORMAL",
+    f"busy_timeout = {BUSY_TIMEOUT_MS}",
+)
+READER_PRAGMAS: Final = (f"busy_timeout = {BUSY_TIMEOUT_MS}", "query_only = ON")
+
+# SQLite virtual machine steps between checks for an interrupt
+PROGRESS_STEPS: Final = 1000
+_INTERRUPT: Final = "interrupt"
+
+
+def _on_connect(
+    pragmas: tuple[str, ...],
+) -> Callable[[Any, ConnectionPoolEntry], None]:
+    def connect(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+        # The handler runs on the connection's own thread and aborts the
+        # running statement once the flag is set.
+        flag = record.info[_INTERRUPT] = threading.Event()
+        driver = dbapi_connection.driver_connection
+        dbapi_connection.await_(
+            driver.set_progress_handler(flag.is_set, PROGRESS_STEPS)
+        )
+
+    return connect
+
+
+# The pool is explicit: before SQLAlchemy 2.0.38, aiosqlite file databases got a
+# NullPool, which takes no size.
+# Created on first use: the database path is read only then, and commands
+# that never touch the database do not pay for the engines.
+_engine: AsyncEngine | None = None
+_read_engine: AsyncEngine | None = None
+
+
+def get_engine() -> AsyncEngine:
+    """The engine of the single writer connection."""
+
+    global _engine
+
+    if _engine is None:
+        _engine = create_async_engine(
+            get_db_connection_url(),
+            echo=False,
+            future=True,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+        )
+        event.listen(_engine.sync_engine, "connect", _on_connect(WRITER_PRAGMAS))
+    return _engine
+
+
+def get_read_engine() -> AsyncEngine:
+    global _read_engine
+
+    if _read_engine is None:
+        _read_engine = create_async_engine(
+            get_db_connection_url(),
+            echo=False,
+            future=True,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=READ_POOL_SIZE,
+            max_overflow=0,
+        )
+        event.listen(_read_engine.sync_engine, "connect", _on_connect(READER_PRAGMAS))
+    return _read_engine
+
+
+class RoutingSession(Session):
+    """
+    Session reading through the pool of readers until it writes.
+
+    From the first write to the end of the transaction everything goes to the
+    writer, so the transaction reads its own changes.
+    """
+
+    writing = False
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Engine:
+        if self.writing or self._flushing or isinstance(clause, UpdateBase):
+            self.writing = True
+            return get_engine().sync_engine
+        return get_read_engine().sync_engine
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _track_interrupt(
+    session: RoutingSession, transaction: SessionTransaction, connection: Connection
+) -> None:
+    # the flags of the writer and the readers the transaction runs statements on
+    session.info.setdefault(_INTERRUPT, []).append(connection.info[_INTERRUPT])
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _end_writing(session: RoutingSession, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.writing = False
+        session.info.pop(_INTERRUPT, None)
+
+
+session_factory = async_sessionmaker(sync_session_class=RoutingSession)
 
 
 def new_session() -> AsyncSession:
-    return async_sessionmaker(engine)()
+    return session_factory()
 
 
 async def scalar[T: Base](session: AsyncSession, query: Query[T]) -> T | None:
@@ -32,5 +157,34 @@ async def scalars_list[T](session: AsyncSession, query: Query[T]) -> list[T]:
     return list(res.all())
 
 
-async def execute(session: AsyncSession, query: ModifyQuery) -> None:
-    await session.execute(query)
+async def execute(
+    session: AsyncSession,
+    query: ModifyQuery,
+    params: Sequence[Mapping[str, Any]] | None = None,
+) -> None:
+    await session.execute(query, params)
+
+
+async def interruptible[T](session: AsyncSession, work: Awaitable[T]) -> T:
+    """
+    Await queries of the session so that cancelling them aborts the statement.
+
+    The work runs in its own task. On cancellation the statements running on the
+    connections of the session, the writer's or a reader's, are interrupted, and
+    the task is awaited, so the session is not closed while SQLite is still busy.
+    """
+
+    flags = list[threading.Event]()
+    task = asyncio.ensure_future(work)
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        flags += session.sync_session.info.get(_INTERRUPT, [])
+        for flag in flags:
+            flag.set()
+        with suppress(Exception):
+            await task
+        raise
+    finally:
+        for flag in flags:
+            flag.clear()
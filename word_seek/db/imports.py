@@ -5,10 +5,16 @@ from sqlalchemy import String, bindparam, select
 from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..index.fuzzy import deletion_keys
 from ..utils.collections import aio_chunks
-from .models import Article, ArticleImportItem, Dictionary, Phrase
+from .models import Article, ArticleImportItem, Dictionary, Phrase, PhraseDeletion
+from .queries import bump_content_generation
 
 BATCH_ROWS: Final = 16384
+INSERT_DELETIONS: Final = (
+    f"INSERT OR IGNORE INTO {PhraseDeletion.__tablename__} (key, phrase_id) "
+    "VALUES (?, ?)"
+)
 
 
 async def _import_batch(
@@ -23,15 +29,24 @@ async def _import_batch(
             "index": i.index,
             "dtype": i.format,
             "text": i.text,
+            "tokens": i.tokens,
         }
         for i in batch
     ]
     phrase_id_query = select(p.id).where(p.text == phrase_prm).scalar_subquery()
 
-    await session.execute(
-        insert(Phrase).on_conflict_do_nothing(index_elements=["text"]),
+    new_phrases = await session.execute(
+        insert(Phrase)
+        .on_conflict_do_nothing(index_elements=["text"])
+        .returning(Phrase.id, Phrase.text),
         phrases_prms,
     )
+    deletions = [(key, id) for id, text in new_phrases for key in deletion_keys(text)]
+    if deletions:
+        # Plain DBAPI executemany: ORM and Core parameter processing costs more
+        # than computing the keys for these rows.
+        conn = await session.connection()
+        await conn.exec_driver_sql(INSERT_DELETIONS, sorted(deletions))
     await session.execute(
         insert(Article).values(phrase_id=phrase_id_query),
         prm_batch,
@@ -49,3 +64,4 @@ async def import_dictionary(
     async for batch in aio_chunks(articles, batch_row_count):
         await _import_batch(session, dictionary.id, batch)
         yield batch
+    await session.execute(bump_content_generation())
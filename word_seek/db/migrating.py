@@ -1,26 +1,50 @@
 import logging
 from importlib import resources
+from typing import TYPE_CHECKING, Final
 
-import alembic.runtime.migration
-from alembic import command
-from alembic.config import Config
-from sqlalchemy import Connection
+from sqlalchemy import Connection, text
+from sqlalchemy.exc import OperationalError
 
 from .config import get_db_connection_url
-from .exec import engine
+from .exec import get_engine, get_read_engine
 
-alembic.runtime.migration.log.addFilter(lambda rec: rec.levelno >= logging.ERROR)
+if TYPE_CHECKING:
+    from alembic.config import Config
+
+# The newest revision in alembic/versions, kept in sync by a test. Alembic is
+# imported only when the database is behind it.
+HEAD_REVISION: Final = "6ef021031dc4"
+_LIST_VERSIONS: Final = text("SELECT version_num FROM alembic_version")
+
+
+def _errors_only(record: logging.LogRecord) -> bool:
+    return record.levelno >= logging.ERROR
+
+
+async def is_up_to_date() -> bool:
+    async with get_read_engine().connect() as conn:
+        try:
+            versions = (await conn.execute(_LIST_VERSIONS)).scalars().all()
+        except OperationalError:
+            return False
+    return list(versions) == [HEAD_REVISION]
 
 
 async def run_async_upgrade() -> None:
+    import alembic.runtime.migration
+    from alembic.config import Config
+
+    alembic.runtime.migration.log.addFilter(_errors_only)
     with resources.path("word_seek", "alembic.ini") as config_path:
         config = Config(config_path)
     config.set_main_option("sqlalchemy.url", get_db_connection_url())
 
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(_run_upgrade, config)
 
 
-def _run_upgrade(connection: Connection, config: Config) -> None:
+def _run_upgrade(connection: Connection, config: "Config") -> None:
+    from alembic import command
+
     config.attributes["connection"] = connection
     command.upgrade(config, "head")
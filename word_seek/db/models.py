@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import StrEnum
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -32,6 +32,14 @@ class Phrase(Base):
     text: Mapped[str] = mapped_column(index=True, unique=True)
 
 
+class PhraseDeletion(Base):
+    __tablename__ = "phrase_deletion"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    key: Mapped[int] = mapped_column(primary_key=True)
+    phrase_id: Mapped[int] = mapped_column(ForeignKey("phrase.id"), primary_key=True)
+
+
 class ArticleFormat(StrEnum):
     TEXT = "text"
     XDXF = "xdxf"
@@ -48,6 +56,8 @@ class Article(Base):
     index: Mapped[int]
     dtype: Mapped[ArticleFormat]
     text: Mapped[str]
+    # compiled markup, see word_seek.formats.tokens
+    tokens: Mapped[str | None] = mapped_column(default=None)
 
 
 class ViewLog(Base):
@@ -56,7 +66,83 @@ class ViewLog(Base):
     id: Mapped[int] = mapped_column(primary_key=True, init=False)
     phrase_id: Mapped[int] = mapped_column(ForeignKey("phrase.id"), index=True)
     phrase: Mapped[Phrase] = relationship(Phrase, init=False, lazy="joined")
-    shown_at_utc: Mapped[datetime]
+    shown_at_utc: Mapped[datetime] = mapped_column(index=True)
+
+
+class PhraseStats(Base):
+    __tablename__ = "phrase_stats"
+    __table_args__ = (
+        Index("ix_phrase_stats_popularity", "view_count", "last_viewed_utc"),
+    )
+
+    phrase_id: Mapped[int] = mapped_column(ForeignKey("phrase.id"), primary_key=True)
+    view_count: Mapped[int]
+    last_viewed_utc: Mapped[datetime]
+
+
+class ContentGeneration(Base):
+    """Single-row counter bumped whenever dictionary content or order changes."""
+
+    __tablename__ = "content_generation"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    generation: Mapped[int] = mapped_column(default=0)
+
+
+@dataclass(slots=True)
+class PhraseRow:
+    id: int
+    text: str
+
+
+@dataclass(slots=True, frozen=True)
+class DictionaryRow:
+    id: int
+    title: str
+    sort_order: int | None
+
+
+@dataclass(slots=True)
+class ArticleRow:
+    id: int
+    phrase_id: int
+    # shared by all the articles of the dictionary
+    dictionary: DictionaryRow
+    index: int
+    dtype: ArticleFormat
+    text: str
+    tokens: str | None
+
+
+@dataclass(slots=True)
+class ViewLogRow:
+    id: int
+    phrase_id: int
+    phrase: PhraseRow
+    shown_at_utc: datetime
+
+
+@dataclass
+class PhraseLookup:
+    phrase: Phrase
+    articles: list[ArticleRow]
+
+
+@dataclass(slots=True)
+class TermLookup:
+    term: str
+    # None when no phrase equals the term
+    phrase: PhraseRow | None
+    articles: list[ArticleRow]
+
+
+@dataclass(slots=True)
+class TermMatch:
+    term: str
+    # None when no phrase equals the term
+    phrase: PhraseRow | None
+    # the dictionaries with an article of the phrase
+    dictionary_ids: list[int]
 
 
 @dataclass
@@ -65,3 +151,4 @@ class ArticleImportItem:
     index: int
     format: ArticleFormat
     text: str
+    tokens: str | None = None
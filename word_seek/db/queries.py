@@ -1,31 +1,82 @@
+from collections.abc import Collection
 from datetime import datetime
+from typing import Final
 
-from sqlalchemy import delete, select
-from sqlalchemy.sql import Delete, Select, Update
+from sqlalchemy import delete, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql import Delete, Insert, Select, Update
 from sqlalchemy.sql.expression import null
 
 from ..utils.models import range_lim
 from ..utils.orm import sqlite
-from .models import Article, Dictionary, Phrase, ViewLog
+from .models import (
+    Article,
+    ContentGeneration,
+    Dictionary,
+    Phrase,
+    PhraseDeletion,
+    PhraseStats,
+    ViewLog,
+    ViewLogRow,
+)
 
 type Query[T] = Select[tuple[T]]
-type ModifyQuery = Delete | Update
+type ModifyQuery = Delete | Insert | Update
+type ViewLogRef = ViewLog | ViewLogRow | int
+type ViewLogRefs = ViewLogRef | list[ViewLog] | list[ViewLogRow] | list[int]
+
+CONTENT_GENERATION_ID: Final = 1
 
 
 def find_checksum(checksum: str) -> Query[Dictionary]:
     return select(Dictionary).where(Dictionary.checksum == checksum).limit(1)
 
 
-def find_phrase(phrase: str, limit: int = 16, offset: int = 0) -> Query[Phrase]:
+def find_exact_phrase(phrase: str) -> Query[Phrase]:
+    return select(Phrase).where(Phrase.text == phrase)
+
+
+def find_phrase(
+    phrase: str, limit: int = 16, after: str | None = None
+) -> Query[Phrase]:
+    position = sqlite.instr(Phrase.text, phrase)
+    query = select(Phrase).where(position > 0)
+    if after is not None:
+        cursor = tuple_(sqlite.instr(after, phrase), literal(after))
+        query = query.where(tuple_(position, Phrase.text) > cursor)
+    return query.order_by(position, Phrase.text).limit(limit)
+
+
+def find_popular_phrase(phrase: str, limit: int = 16) -> Query[Phrase]:
     return (
         select(Phrase)
-        .where(sqlite.instr(Phrase.text, phrase) > 0)
-        .order_by(sqlite.instr(Phrase.text, phrase), Phrase.text)
-        .offset(offset)
+        .join(PhraseStats)
+        .where(sqlite.instr(Phrase.text, phrase) == 1)
+        .order_by(PhraseStats.view_count.desc(), PhraseStats.last_viewed_utc.desc())
         .limit(limit)
     )
 
 
+def find_phrase_by_deletions(
+    keys: Collection[int], length: range_lim[int]
+) -> Select[tuple[int, str, int]]:
+    views = (
+        select(PhraseStats.view_count)
+        .where(PhraseStats.phrase_id == Phrase.id)
+        .scalar_subquery()
+    )
+    return select(Phrase.id, Phrase.text, func.coalesce(views, 0)).where(
+        Phrase.id.in_(
+            select(PhraseDeletion.phrase_id).where(PhraseDeletion.key.in_(keys))
+        ),
+        func.length(Phrase.text).between(length.start, length.end),
+    )
+
+
+def list_phrases(ids: Collection[int]) -> Query[Phrase]:
+    return select(Phrase).where(Phrase.id.in_(ids))
+
+
 def find_articles(phrase: Phrase) -> Query[Article]:
     return (
         select(Article)
@@ -35,24 +86,100 @@ def find_articles(phrase: Phrase) -> Query[Article]:
     )
 
 
+def list_phrase_texts() -> Query[str]:
+    return select(Phrase.text)
+
+
+def max_phrase_id() -> Query[int | None]:
+    return select(func.max(Phrase.id))
+
+
+def list_dict_checksums() -> Query[str]:
+    return select(Dictionary.checksum).order_by(Dictionary.checksum)
+
+
+def get_content_generation() -> Query[int]:
+    return select(ContentGeneration.generation).where(
+        ContentGeneration.id == CONTENT_GENERATION_ID
+    )
+
+
+def bump_content_generation() -> ModifyQuery:
+    return (
+        update(ContentGeneration)
+        .where(ContentGeneration.id == CONTENT_GENERATION_ID)
+        .values(generation=ContentGeneration.generation + 1)
+    )
+
+
 def list_dicts() -> Query[Dictionary]:
     return select(Dictionary).order_by(
         Dictionary.sort_order == null(), Dictionary.sort_order
     )
 
 
-def list_view_logs(limit: int = 16, offset: int = 0) -> Query[ViewLog]:
-    return (
-        select(ViewLog)
-        .order_by(ViewLog.shown_at_utc.desc())
-        .offset(offset)
-        .limit(limit)
+def list_view_logs(limit: int = 16, before: ViewLog | None = None) -> Query[ViewLog]:
+    query = select(ViewLog)
+    if before is not None:
+        cursor = tuple_(
+            literal(before.shown_at_utc, ViewLog.shown_at_utc.type),
+            literal(before.id),
+        )
+        query = query.where(tuple_(ViewLog.shown_at_utc, ViewLog.id) < cursor)
+    return query.order_by(ViewLog.shown_at_utc.desc(), ViewLog.id.desc()).limit(limit)
+
+
+def upsert_phrase_stats(phrase_id: int, shown_at_utc: datetime) -> ModifyQuery:
+    query = sqlite_insert(PhraseStats).values(
+        phrase_id=phrase_id, view_count=1, last_viewed_utc=shown_at_utc
+    )
+    return query.on_conflict_do_update(
+        index_elements=[PhraseStats.phrase_id],
+        set_={
+            PhraseStats.view_count: PhraseStats.view_count + 1,
+            PhraseStats.last_viewed_utc: func.max(
+                PhraseStats.last_viewed_utc, query.excluded.last_viewed_utc
+            ),
+        },
+    )
+
+
+def insert_view_logs() -> ModifyQuery:
+    return insert(ViewLog)
+
+
+def add_phrase_stats() -> ModifyQuery:
+    """Upsert stats of many phrases, adding to the counts of the existing ones"""
+
+    query = sqlite_insert(PhraseStats)
+    return query.on_conflict_do_update(
+        index_elements=[PhraseStats.phrase_id],
+        set_={
+            PhraseStats.view_count: PhraseStats.view_count + query.excluded.view_count,
+            PhraseStats.last_viewed_utc: func.max(
+                PhraseStats.last_viewed_utc, query.excluded.last_viewed_utc
+            ),
+        },
+    )
+
+
+def delete_phrase_stats() -> ModifyQuery:
+    return delete(PhraseStats)
+
+
+def insert_phrase_stats_from_logs() -> ModifyQuery:
+    aggregate = select(
+        ViewLog.phrase_id, func.count(ViewLog.id), func.max(ViewLog.shown_at_utc)
+    ).group_by(ViewLog.phrase_id)
+    return insert(PhraseStats).from_select(
+        [PhraseStats.phrase_id, PhraseStats.view_count, PhraseStats.last_viewed_utc],
+        aggregate,
     )
 
 
 def delete_view_logs(
     *,
-    items: ViewLog | int | list[ViewLog] | list[int] | None = None,
+    items: ViewLogRefs | None = None,
     shown_at_utc: range_lim[datetime] | datetime | None = None,
 ) -> ModifyQuery:
     query = delete(ViewLog)
@@ -63,7 +190,7 @@ def delete_view_logs(
             query = query.where(ViewLog.id.in_(ids))
         case int() as id:
             query = query.where(ViewLog.id == id)
-        case ViewLog() as log:
+        case ViewLog() | ViewLogRow() as log:
             query = query.where(ViewLog.id == log.id)
 
     match shown_at_utc:
@@ -0,0 +1,213 @@
+import json
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+from typing import Any, Final
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import (
+    Article,
+    ArticleFormat,
+    ArticleRow,
+    ContentGeneration,
+    Dictionary,
+    DictionaryRow,
+    Phrase,
+    PhraseRow,
+    PhraseStats,
+    TermLookup,
+    TermMatch,
+    ViewLog,
+    ViewLogRow,
+)
+from .queries import CONTENT_GENERATION_ID
+
+# Hot reads skip the ORM: the statements go straight to the driver connection
+# of the session, and rows become slotted objects. Each statement is compiled
+# once and then served from the SQLite statement cache of the connection.
+
+FIND_PHRASES: Final = (
+    f"SELECT id, text FROM {Phrase.__tablename__} "
+    "WHERE instr(text, :phrase) > 0 "
+    "ORDER BY instr(text, :phrase), text LIMIT :limit"
+)
+FIND_PHRASES_AFTER: Final = (
+    f"SELECT id, text FROM {Phrase.__tablename__} "
+    "WHERE instr(text, :phrase) > 0 "
+    "AND (instr(text, :phrase), text) > (instr(:after, :phrase), :after) "
+    "ORDER BY instr(text, :phrase), text LIMIT :limit"
+)
+FIND_POPULAR_PHRASES: Final = (
+    f"SELECT p.id, p.text FROM {Phrase.__tablename__} AS p "
+    f"JOIN {PhraseStats.__tablename__} AS s ON s.phrase_id = p.id "
+    "WHERE instr(p.text, :phrase) = 1 "
+    "ORDER BY s.view_count DESC, s.last_viewed_utc DESC LIMIT :limit"
+)
+FIND_ARTICLES: Final = (
+    'SELECT a.id, a."index", a.dtype, a.text, a.tokens, '
+    "d.id, d.title, d.sort_order "
+    f"FROM {Article.__tablename__} AS a "
+    f"JOIN {Dictionary.__tablename__} AS d ON d.id = a.dictionary_id "
+    "WHERE a.phrase_id = :phrase_id "
+    "ORDER BY d.sort_order IS NULL, d.sort_order"
+)
+# The terms are a JSON array, so that any number of them is a single parameter
+# and the reader needs no temporary table; phrases are found by the text index.
+LOOKUP_TERMS: Final = (
+    'SELECT t.key, p.id, p.text, a.id, a."index", a.dtype, a.text, a.tokens, '
+    "d.id, d.title, d.sort_order "
+    "FROM json_each(:terms) AS t "
+    f"LEFT JOIN {Phrase.__tablename__} AS p ON p.text = t.value "
+    f"LEFT JOIN {Article.__tablename__} AS a ON a.phrase_id = p.id "
+    f"LEFT JOIN {Dictionary.__tablename__} AS d ON d.id = a.dictionary_id "
+    "ORDER BY t.key, d.sort_order IS NULL, d.sort_order"
+)
+MATCH_TERMS: Final = (
+    "SELECT DISTINCT t.key, p.id, p.text, a.dictionary_id "
+    "FROM json_each(:terms) AS t "
+    f"JOIN {Phrase.__tablename__} AS p ON p.text = t.value "
+    f"LEFT JOIN {Article.__tablename__} AS a ON a.phrase_id = p.id"
+)
+LIST_VIEW_LOGS: Final = (
+    "SELECT v.id, v.phrase_id, v.shown_at_utc, p.text "
+    f"FROM {ViewLog.__tablename__} AS v "
+    f"JOIN {Phrase.__tablename__} AS p ON p.id = v.phrase_id "
+    "ORDER BY v.shown_at_utc DESC, v.id DESC LIMIT :limit"
+)
+LIST_VIEW_LOGS_BEFORE: Final = (
+    "SELECT v.id, v.phrase_id, v.shown_at_utc, p.text "
+    f"FROM {ViewLog.__tablename__} AS v "
+    f"JOIN {Phrase.__tablename__} AS p ON p.id = v.phrase_id "
+    "WHERE (v.shown_at_utc, v.id) < (:shown_at_utc, :id) "
+    "ORDER BY v.shown_at_utc DESC, v.id DESC LIMIT :limit"
+)
+GET_CONTENT_GENERATION: Final = (
+    f"SELECT generation FROM {ContentGeneration.__tablename__} "
+    f"WHERE id = {CONTENT_GENERATION_ID}"
+)
+
+# one object per dictionary, shared by all the articles read; replaced when the
+# dictionary is renamed or reordered, so it holds one entry per id
+_dictionaries = dict[int, DictionaryRow]()
+
+
+async def _fetch(
+    session: AsyncSession, sql: str, params: Mapping[str, Any] | None = None
+) -> Iterable[Any]:
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    driver: Any = raw.driver_connection
+    return await driver.execute_fetchall(sql, params)
+
+
+def _dictionary(id: int, title: str, sort_order: int | None) -> DictionaryRow:
+    dictionary = _dictionaries.get(id)
+    if (
+        dictionary is None
+        or dictionary.title != title
+        or dictionary.sort_order != sort_order
+    ):
+        dictionary = _dictionaries[id] = DictionaryRow(id, title, sort_order)
+    return dictionary
+
+
+def _format_datetime(value: datetime) -> str:
+    # the storage format of SQLAlchemy's SQLite DateTime
+    return value.replace(tzinfo=None).isoformat(" ", "microseconds")
+
+
+async def find_phrases(
+    session: AsyncSession, phrase: str, limit: int, after: str | None = None
+) -> list[PhraseRow]:
+    if after is None:
+        params = {"phrase": phrase, "limit": limit}
+        rows = await _fetch(session, FIND_PHRASES, params)
+    else:
+        params = {"phrase": phrase, "limit": limit, "after": after}
+        rows = await _fetch(session, FIND_PHRASES_AFTER, params)
+    return [PhraseRow(id, text) for id, text in rows]
+
+
+async def find_popular_phrases(
+    session: AsyncSession, phrase: str, limit: int
+) -> list[PhraseRow]:
+    params = {"phrase": phrase, "limit": limit}
+    rows = await _fetch(session, FIND_POPULAR_PHRASES, params)
+    return [PhraseRow(id, text) for id, text in rows]
+
+
+async def find_articles(session: AsyncSession, phrase_id: int) -> list[ArticleRow]:
+    rows = await _fetch(session, FIND_ARTICLES, {"phrase_id": phrase_id})
+    return [
+        ArticleRow(
+            id,
+            phrase_id,
+            _dictionary(dict_id, title, sort_order),
+            index,
+            ArticleFormat[dtype],
+            text,
+            tokens,
+        )
+        for id, index, dtype, text, tokens, dict_id, title, sort_order in rows
+    ]
+
+
+async def lookup_terms(session: AsyncSession, terms: list[str]) -> list[TermLookup]:
+    found = [TermLookup(term, None, []) for term in terms]
+    rows = await _fetch(session, LOOKUP_TERMS, {"terms": json.dumps(terms)})
+    for pos, phrase_id, phrase, id, index, dtype, text, tokens, *dictionary in rows:
+        lookup = found[pos]
+        if phrase_id is None:
+            continue
+        if lookup.phrase is None:
+            lookup.phrase = PhraseRow(phrase_id, phrase)
+        if id is not None:
+            lookup.articles.append(
+                ArticleRow(
+                    id,
+                    phrase_id,
+                    _dictionary(*dictionary),
+                    index,
+                    ArticleFormat[dtype],
+                    text,
+                    tokens,
+                )
+            )
+    return found
+
+
+async def match_terms(session: AsyncSession, terms: list[str]) -> list[TermMatch]:
+    found = [TermMatch(term, None, []) for term in terms]
+    rows = await _fetch(session, MATCH_TERMS, {"terms": json.dumps(terms)})
+    for pos, phrase_id, phrase, dictionary_id in rows:
+        match = found[pos]
+        if match.phrase is None:
+            match.phrase = PhraseRow(phrase_id, phrase)
+        if dictionary_id is not None:
+            match.dictionary_ids.append(dictionary_id)
+    return found
+
+
+async def list_view_logs(
+    session: AsyncSession, limit: int, before: ViewLog | ViewLogRow | None = None
+) -> list[ViewLogRow]:
+    if before is None:
+        rows = await _fetch(session, LIST_VIEW_LOGS, {"limit": limit})
+    else:
+        params = {
+            "limit": limit,
+            "shown_at_utc": _format_datetime(before.shown_at_utc),
+            "id": before.id,
+        }
+        rows = await _fetch(session, LIST_VIEW_LOGS_BEFORE, params)
+    return [
+        ViewLogRow(
+            id, phrase_id, PhraseRow(phrase_id, text), datetime.fromisoformat(at)
+        )
+        for id, phrase_id, at, text in rows
+    ]
+
+
+async def get_content_generation(session: AsyncSession) -> int:
+    ((generation,),) = await _fetch(session, GET_CONTENT_GENERATION)
+    return generation
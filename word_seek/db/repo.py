@@ -1,12 +1,25 @@
-from datetime import datetime
+import hashlib
+from collections import Counter
+from datetime import datetime, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import null
 
+from ..index import fuzzy
 from ..utils.models import range_lim
-from . import exec, queries
-from .decorators import transact
-from .models import Article, Dictionary, Phrase, ViewLog
+from . import cache, exec, queries, reads
+from .decorators import transact, transact_write
+from .models import (
+    ArticleRow,
+    Dictionary,
+    Phrase,
+    PhraseLookup,
+    PhraseRow,
+    TermLookup,
+    TermMatch,
+    ViewLog,
+    ViewLogRow,
+)
 
 
 @transact
@@ -16,14 +29,110 @@ async def find_checksum(session: AsyncSession, checksum: str) -> Dictionary | No
 
 @transact
 async def find_phrases(
-    session: AsyncSession, phrase: str, limit: int = 16, offset: int = 0
+    session: AsyncSession, phrase: str, limit: int = 16, after: str | None = None
+) -> list[PhraseRow]:
+    return await reads.find_phrases(session, phrase, limit, after)
+
+
+@transact
+async def find_popular_phrases(
+    session: AsyncSession, phrase: str, limit: int = 16
+) -> list[PhraseRow]:
+    return await reads.find_popular_phrases(session, phrase, limit)
+
+
+@transact
+async def find_similar_phrases(
+    session: AsyncSession,
+    phrase: str,
+    limit: int = 16,
+    max_distance: int | None = None,
 ) -> list[Phrase]:
-    return await exec.scalars_list(session, queries.find_phrase(phrase, limit, offset))
+    term = fuzzy.normalize(phrase)
+    if max_distance is None:
+        max_distance = fuzzy.max_distance_for(term)
+    length = range_lim(len(term) - max_distance, len(term) + max_distance)
+    keys = fuzzy.deletion_keys(term, max_distance)
+    query = queries.find_phrase_by_deletions(keys, length)
+    ranked = list[tuple[int, int, str, int]]()
+    for id, text, views in await session.execute(query):
+        distance = fuzzy.edit_distance(term, fuzzy.normalize(text), max_distance)
+        if distance <= max_distance:
+            ranked.append((distance, -views, text, id))
+    ranked.sort()
+
+    ids = [id for *_, id in ranked[:limit]]
+    phrases = await exec.scalars_list(session, queries.list_phrases(ids))
+    phrases.sort(key=lambda phrase: ids.index(phrase.id))
+    return phrases
+
+
+@transact
+async def get_content_generation(session: AsyncSession) -> int:
+    return await reads.get_content_generation(session)
+
+
+@transact
+async def find_articles(
+    session: AsyncSession, phrase: Phrase | PhraseRow
+) -> list[ArticleRow]:
+    generation = await reads.get_content_generation(session)
+    articles = cache.articles.get(phrase.id, generation)
+    if articles is None:
+        articles = await reads.find_articles(session, phrase.id)
+        cache.articles.put(phrase.id, articles, generation)
+    return list(articles)
+
+
+@transact_write
+async def lookup(
+    session: AsyncSession, term: str, exact: bool = False, log_view: bool = True
+) -> PhraseLookup | None:
+    # An equal phrase is always the best match, and the unique index finds it
+    # without scanning the whole phrase table.
+    phrase = await exec.scalar(session, queries.find_exact_phrase(term))
+    if not phrase:
+        phrase = await exec.scalar(session, queries.find_phrase(term, 1))
+    if not phrase or (exact and phrase.text.strip() != term.strip()):
+        return None
+    result = PhraseLookup(phrase, await find_articles.in_session(session, phrase))
+
+    # The results outlive the session, and the write lock is taken only after
+    # all the reads are done.
+    session.expunge_all()
+    if log_view:
+        log = ViewLog(phrase_id=phrase.id, shown_at_utc=datetime.now(timezone.utc))
+        await update_view_log.in_session(session, log)
+    return result
+
+
+@transact
+async def lookup_terms(session: AsyncSession, terms: list[str]) -> list[TermLookup]:
+    """Phrases equal to the terms, in their order, with one query for all"""
+
+    return await reads.lookup_terms(session, terms)
+
+
+@transact
+async def match_terms(session: AsyncSession, terms: list[str]) -> list[TermMatch]:
+    """Like lookup_terms, with the dictionaries of the phrases for articles"""
+
+    return await reads.match_terms(session, terms)
+
+
+@transact
+async def list_phrase_texts(session: AsyncSession) -> list[str]:
+    return await exec.scalars_list(session, queries.list_phrase_texts())
 
 
 @transact
-async def find_articles(session: AsyncSession, phrase: Phrase) -> list[Article]:
-    return await exec.scalars_list(session, queries.find_articles(phrase))
+async def headwords_stamp(session: AsyncSession) -> bytes:
+    max_id = await exec.scalar_one(session, queries.max_phrase_id())
+    checksums = await exec.scalars_list(session, queries.list_dict_checksums())
+    digest = hashlib.sha1(str(max_id).encode())
+    for checksum in checksums:
+        digest.update(checksum.encode())
+    return digest.digest()
 
 
 @transact
@@ -31,7 +140,7 @@ async def list_dicts(session: AsyncSession) -> list[Dictionary]:
     return await exec.scalars_list(session, queries.list_dicts())
 
 
-@transact
+@transact_write
 async def sort_dict(
     session: AsyncSession, dictionary: Dictionary | int, order: int
 ) -> None:
@@ -55,30 +164,53 @@ async def sort_dict(
             dct.sort_order = next_order
             session.add(dct)
         next_order = dct.sort_order + 1
+    await exec.execute(session, queries.bump_content_generation())
     await session.commit()
 
 
 @transact
 async def list_view_logs(
-    session: AsyncSession, limit: int = 16, offset: int = 0
-) -> list[ViewLog]:
-    return await exec.scalars_list(session, queries.list_view_logs(limit, offset))
+    session: AsyncSession, limit: int = 16, before: ViewLog | ViewLogRow | None = None
+) -> list[ViewLogRow]:
+    return await reads.list_view_logs(session, limit, before)
 
 
-@transact
+@transact_write
 async def update_view_log(session: AsyncSession, log: ViewLog) -> None:
     session.add(log)
+    await exec.execute(
+        session, queries.upsert_phrase_stats(log.phrase_id, log.shown_at_utc)
+    )
     await session.commit()
 
 
-@transact
+@transact_write
+async def add_view_logs(session: AsyncSession, phrase_ids: list[int]) -> None:
+    """Log views of many phrases at once, each statement run for all of them"""
+
+    if not phrase_ids:
+        return
+    shown_at_utc = datetime.now(timezone.utc)
+    logs = [{"phrase_id": id, "shown_at_utc": shown_at_utc} for id in phrase_ids]
+    await exec.execute(session, queries.insert_view_logs(), logs)
+    stats = [
+        {"phrase_id": id, "view_count": count, "last_viewed_utc": shown_at_utc}
+        for id, count in Counter(phrase_ids).items()
+    ]
+    await exec.execute(session, queries.add_phrase_stats(), stats)
+    await session.commit()
+
+
+@transact_write
 async def clear_view_logs(
     session: AsyncSession,
     *,
-    items: ViewLog | int | list[ViewLog] | list[int] | None = None,
+    items: queries.ViewLogRefs | None = None,
     shown_at_utc: range_lim[datetime] | datetime | None = None,
 ) -> None:
     await exec.execute(
         session, queries.delete_view_logs(items=items, shown_at_utc=shown_at_utc)
     )
+    await exec.execute(session, queries.delete_phrase_stats())
+    await exec.execute(session, queries.insert_phrase_stats_from_logs())
     await session.commit()
@@ -1,18 +1,29 @@
 import os
 from functools import partial
+from typing import Final
 
 from anyio import Path, to_thread
 
-from .config import get_db_path
-from .migrating import run_async_upgrade
+from .config import get_db_path, get_headwords_path, get_suggestions_path
+
+WAL_SUFFIXES: Final = ("-wal", "-shm")
 
 _db_initialized = False
 
 
 async def wipeout() -> None:
-    path = Path(get_db_path())
-    if await path.exists():
-        await to_thread.run_sync(partial(os.remove, get_db_path()))
+    db_path = get_db_path()
+    # the write-ahead log and its index live next to the database
+    wal_paths = (db_path.with_name(f"{db_path.name}{end}") for end in WAL_SUFFIXES)
+    for file_path in (
+        db_path,
+        *wal_paths,
+        get_headwords_path(),
+        get_suggestions_path(),
+    ):
+        path = Path(file_path)
+        if await path.exists():
+            await to_thread.run_sync(partial(os.remove, file_path))
 
 
 async def _ensure_dir() -> None:
@@ -24,6 +35,10 @@ async def ensure_db() -> None:
     global _db_initialized
 
     if not _db_initialized:
+        # SQLAlchemy is loaded only here, not for the wipeout
+        from .migrating import is_up_to_date, run_async_upgrade
+
         await _ensure_dir()
-        await run_async_upgrade()
+        if not await is_up_to_date():
+            await run_async_upgrade()
         _db_initialized = True
@@ -1,18 +1,28 @@
 import asyncio
-from async_lru import alru_cache
-from dataclasses import dataclass
+import json
+import os
+import time
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Any, Final
+
+from anyio import to_thread
 from reactivex import Observable
 from reactivex import operators as op
 
 from ..db import repo
-from ..rxutil import async_observable
+from ..db.config import get_suggestions_path
+from ..index import headwords
+from ..rxutil import async_observable, loop_scheduler
+from ..utils.cache import LRUCache
 
 
 @dataclass(slots=True, frozen=True)
 class PhrasesQuery:
     phrase: str
     limit: int = 50
-    offset: int = 0
+    after: str | None = None
+    fuzzy: bool = True
 
 
 @dataclass
@@ -20,23 +30,245 @@ class FoundPhrases:
     query: PhrasesQuery
     suggestions: list[str]
     has_more: bool
+    fuzzy: bool = False
+    cursor: str | None = None
+
+    def next_query(self) -> PhrasesQuery:
+        return replace(self.query, after=self.cursor)
+
+
+@dataclass(slots=True, frozen=True)
+class Matches:
+    texts: list[str]
+    # whether no more phrases match past the texts
+    complete: bool
+
+
+# the phrase, the cursor, and whether the matches are similar phrases
+type MatchesKey = tuple[str, str | None, bool]
+
+MATCHES_MAX_BYTES: Final = 4 * 1024 * 1024
+# similar phrases are ranked by views too, which the content generation ignores
+MATCHES_TTL: Final = 24 * 3600.0
+# how long a read content generation is trusted
+GENERATION_CHECK_INTERVAL: Final = 1.0
+CACHE_VERSION: Final = 1
+
+
+@dataclass(slots=True)
+class AutocompleteStats:
+    started: int = 0
+    completed: int = 0
+    # interrupted before they completed
+    cancelled: int = 0
+    # completed after a newer query was issued, so never shown
+    superseded: int = 0
+    # answered from an earlier complete result, without the DB
+    narrowed: int = 0
+
+    @property
+    def wasted(self) -> int:
+        return self.cancelled + self.superseded
+
+
+def _matches_size(matches: Matches) -> int:
+    return sum(len(text.encode()) for text in matches.texts)
+
+
+stats = AutocompleteStats()
+# Only the matches are cached: they depend on the dictionaries alone, while
+# popular phrases change with every view and are always read anew.
+cache = LRUCache[MatchesKey, Matches](
+    MATCHES_MAX_BYTES, _matches_size, ttl=MATCHES_TTL, clock=time.time
+)
+_generation: int | None = None
+_generation_read_at = 0.0
+
+
+async def _content_generation() -> int:
+    global _generation, _generation_read_at
+
+    now = time.monotonic()
+    if _generation is None or now - _generation_read_at >= GENERATION_CHECK_INTERVAL:
+        _generation = await repo.get_content_generation()
+        _generation_read_at = now
+    return _generation
+
+
+async def _fetch_matches(phrase: str, limit: int, after: str | None) -> Matches:
+    # Prefix matches come first in the DB order, so when the snapshot alone
+    # fills the page, the answer is the same without touching the phrase table.
+    snapshot = await headwords.load()
+    if snapshot and (after is None or after.startswith(phrase)):
+        prefixed = snapshot.prefixed(phrase, limit, after)
+        if len(prefixed) >= limit:
+            return Matches(prefixed, complete=False)
+
+    found = await repo.find_phrases(phrase, limit, after)
+    return Matches([item.text for item in found], complete=len(found) < limit)
+
+
+def _narrow(phrase: str, generation: int) -> Matches | None:
+    """Filter the complete matches of a prefix of the phrase, if they are kept."""
+
+    for end in range(len(phrase) - 1, 0, -1):
+        matches = cache.peek((phrase[:end], None, False), generation)
+        if matches is not None and matches.complete:
+            break
+    else:
+        return None
+
+    texts = [text for text in matches.texts if phrase in text]
+    # the DB order: by the position of the phrase, then by text
+    texts.sort(key=lambda text: (text.find(phrase), text))
+    return Matches(texts, complete=True)
+
+
+async def _find_matches(
+    phrase: str, limit: int, after: str | None, generation: int
+) -> list[str]:
+    key = phrase, after, False
+    matches = cache.get(key, generation)
+    if matches is None or not (matches.complete or len(matches.texts) >= limit):
+        narrowed = _narrow(phrase, generation) if after is None else None
+        if narrowed is not None:
+            stats.narrowed += 1
+            matches = narrowed
+        else:
+            matches = await _fetch_matches(phrase, limit, after)
+        cache.put(key, matches, generation)
+    return matches.texts[:limit]
+
+
+async def _find_similar(phrase: str, limit: int, generation: int) -> list[str]:
+    key = phrase, None, True
+    matches = cache.get(key, generation)
+    if matches is None or len(matches.texts) < limit:
+        found = await repo.find_similar_phrases(phrase, limit)
+        matches = Matches([item.text for item in found], complete=True)
+        cache.put(key, matches, generation)
+    return matches.texts[:limit]
 
 
-@alru_cache(maxsize=32)
 async def find_phrases(query: PhrasesQuery) -> FoundPhrases:
-    result = await repo.find_phrases(query.phrase, query.limit + 1, query.offset)
+    generation = await _content_generation()
+    first_page = query.after is None
+    # Popular phrases lead the first page and are skipped on every page. One
+    # slot is left for a regular match, so the cursor always moves forward.
+    found = await repo.find_popular_phrases(query.phrase, query.limit - 1)
+    popular = [item.text for item in found]
+    popular_set = set(popular)
+
+    limit = query.limit + len(popular) + 1
+    matches = await _find_matches(query.phrase, limit, query.after, generation)
+    if not matches and query.fuzzy and first_page:
+        similar = await _find_similar(query.phrase, query.limit, generation)
+        return FoundPhrases(
+            query=query,
+            suggestions=similar,
+            has_more=False,
+            fuzzy=True,
+        )
+
+    suggestions = popular if first_page else []
+    cursor, has_more = query.after, len(matches) >= limit
+    for text in matches:
+        if text in popular_set:
+            continue
+        if len(suggestions) >= query.limit:
+            has_more = True
+            break
+        suggestions.append(text)
+        cursor = text
 
     return FoundPhrases(
-        query=query,
-        suggestions=[item.text for item in result[: query.limit]],
-        has_more=len(result) > query.limit,
+        query=query, suggestions=suggestions, has_more=has_more, cursor=cursor
     )
 
 
-def create_autocomplete(query: Observable[PhrasesQuery]) -> Observable[FoundPhrases]:
+async def load_cache() -> None:
+    """Fill the cache with the matches saved by a previous run."""
+
+    match await to_thread.run_sync(partial(_read_json, get_suggestions_path())):
+        case [int() as version, int() as generation, list() as items] if (
+            version == CACHE_VERSION
+        ):
+            for item in items:
+                if entry := _load_entry(item):
+                    key, matches, stored_at = entry
+                    cache.put(key, matches, generation, stored_at)
+
+
+async def save_cache() -> None:
+    if cache.generation is None:
+        return
+    items = [_dump_entry(*entry) for entry in cache.entries()]
+    data = [CACHE_VERSION, cache.generation, items]
+    await to_thread.run_sync(partial(_write_json, get_suggestions_path(), data))
+
+
+def _dump_entry(key: MatchesKey, matches: Matches, stored_at: float) -> Any:
+    return [list(key), [matches.texts, matches.complete], stored_at]
+
+
+def _load_entry(item: Any) -> tuple[MatchesKey, Matches, float] | None:
+    match item:
+        case [
+            [str() as phrase, str() | None as after, bool() as similar],
+            [list() as texts, bool() as complete],
+            int()
+            | float() as stored_at,
+        ]:
+            return (phrase, after, similar), Matches(texts, complete), stored_at
+    return None
+
+
+def _read_json(path: os.PathLike[str]) -> Any:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: os.PathLike[str], data: Any) -> None:
+    temp_path = f"{os.fspath(path)}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+def create_autocomplete(
+    query: Observable[PhrasesQuery], debounce: float = 0.0
+) -> Observable[FoundPhrases]:
+    """
+    Suggestions for the latest query only.
+
+    A new query cancels the one in flight, down to the running SQLite
+    statement. With ``debounce``, a query is started only after no newer one
+    came for that many seconds.
+    """
+
     loop = asyncio.get_running_loop()
+    latest = 0
+
+    async def run_query(query: PhrasesQuery, seq: int) -> FoundPhrases:
+        stats.started += 1
+        try:
+            found = await find_phrases(query)
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            raise
+        stats.completed += 1
+        if seq != latest:
+            stats.superseded += 1
+        return found
 
     def query_observable(query: PhrasesQuery) -> Observable[FoundPhrases]:
-        return async_observable(find_phrases(query), loop)
+        nonlocal latest
+        latest += 1
+        return async_observable(partial(run_query, query, latest), loop)
 
-    return query.pipe(op.flat_map(query_observable))
+    if debounce > 0:
+        query = query.pipe(op.debounce(debounce, scheduler=loop_scheduler(loop)))
+    return query.pipe(op.map(query_observable), op.switch_latest())
@@ -1,64 +1,143 @@
+import asyncio
+import locale
+import os
 import signal
-from collections.abc import Callable, Iterator
+import sys
+import termios
+import tty
+from collections.abc import Callable
 from contextlib import AbstractContextManager
-from threading import Thread
 from types import TracebackType
-from typing import Self
+from typing import Final, Self
 
 from curtsies import events
-from curtsies.input import Input
 from reactivex import Observable, Subject
 
-from .models import InputEvent, KeyEvent, PasteEvent
+from .models import InputEvent, KeyEvent, PasteEvent, SigIntEvent
 
+READ_SIZE: Final = 1024
+# a read longer than any key sequence is a paste
+PASTE_THRESHOLD: Final = events.MAX_KEYPRESS_SIZE + 1
+# seconds to wait for the rest of a key split between reads: a lone ESC, or the
+# first bytes of an escape sequence or of a multibyte character
+KEY_TIMEOUT: Final = 0.05
 
-def map_event(key: str | events.Event | None) -> InputEvent | None:
-    match key:
-        case str():
-            return KeyEvent(key)
-        case events.SigIntEvent() | events.ScheduledEvent():
-            return key
-        case events.PasteEvent():
-            keys = [KeyEvent(k) for k in key.events]
-            return PasteEvent(keys)
-        case _:
-            return None
+
+def decode_keys(
+    data: bytes, encoding: str, *, full: bool = False
+) -> tuple[list[str], bytes]:
+    """
+    Keys of the data, and the bytes left at its end that may start a key yet to
+    be read. With full, the bytes left are decoded as they are.
+    """
+
+    keys = list[str]()
+    current = list[bytes]()
+    for idx in range(len(data)):
+        current.append(data[idx : idx + 1])
+        key = events.get_key(
+            current,
+            encoding,
+            keynames=events.Keynames.CURTSIES,
+            full=full and idx == len(data) - 1,
+        )
+        if key is not None:
+            keys.append(key)
+            current.clear()
+    return keys, b"".join(current)
 
 
 class InputScope(AbstractContextManager["InputScope"]):
+    """
+    Terminal key events read by the running event loop.
+
+    Stdin is watched by the loop's selector, so nothing runs between key presses
+    and a key is handled as soon as it is read. A key split between reads waits
+    for the next one, up to KEY_TIMEOUT. SIGINT is delivered as an event
+    through the loop's signal handling.
+    """
+
     def __init__(self) -> None:
-        self._input = Input(sigint_event=True)
+        assert sys.__stdin__ is not None
+        self._fd = sys.__stdin__.fileno()
+        self._encoding = locale.getpreferredencoding() or sys.getdefaultencoding()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._orig_attrs: list | None = None
         self._prev_sig_handler: Callable[..., None] | signal.Handlers | int | None = (
             None
         )
         self._subject = Subject[InputEvent]()
-        self._thread = Thread(target=self._run)
-
-    def _run(self) -> None:
-        input = iter(self._input)
-        while not self._subject.is_disposed:
-            key = input.send(0.1)
-            event = map_event(key)
-            if event and not self._subject.is_disposed:
-                self._subject.on_next(event)
+        self._observed = False
+        self._queue = asyncio.Queue[InputEvent]()
+        self._pending = b""
+        self._timeout: asyncio.TimerHandle | None = None
+
+    def _on_readable(self) -> None:
+        assert self._loop
+        try:
+            data = os.read(self._fd, READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            # the terminal is gone, nothing else can be read
+            self._loop.remove_reader(self._fd)
+            self._flush()
+            self._emit(SigIntEvent())
+            return
 
-    def _sig_handler(self, *_) -> None:
-        self._input.threadsafe_event_trigger(events.SigIntEvent)
+        if self._timeout:
+            self._timeout.cancel()
+            self._timeout = None
+        decoded, self._pending = decode_keys(self._pending + data, self._encoding)
+        if self._pending:
+            self._timeout = self._loop.call_later(KEY_TIMEOUT, self._flush)
 
-    def input(self) -> Iterator[InputEvent]:
-        for key in self._input:
-            event = map_event(key)
-            if event:
-                yield event
+        keys = [KeyEvent(key) for key in decoded]
+        if len(data) > PASTE_THRESHOLD:
+            self._emit(PasteEvent(keys))
+            return
+        for key in keys:
+            self._emit(key)
+
+    def _flush(self) -> None:
+        if self._timeout:
+            self._timeout.cancel()
+            self._timeout = None
+        decoded, _ = decode_keys(self._pending, self._encoding, full=True)
+        self._pending = b""
+        for key in decoded:
+            self._emit(KeyEvent(key))
+
+    def _emit(self, event: InputEvent) -> None:
+        if self._observed:
+            if not self._subject.is_disposed:
+                self._subject.on_next(event)
+        else:
+            self._queue.put_nowait(event)
+
+    async def next_event(self) -> InputEvent:
+        return await self._queue.get()
 
     def observable(self) -> Observable[InputEvent]:
-        if not self._thread.ident:
-            self._thread.start()
+        self._observed = True
         return self._subject
 
     def __enter__(self) -> Self:
-        self._input = self._input.__enter__()
-        self._prev_sig_handler = signal.signal(signal.SIGINT, self._sig_handler)
+        self._loop = asyncio.get_running_loop()
+        self._orig_attrs = termios.tcgetattr(self._fd)
+        # as with curtsies' Input: Ctrl-S and Ctrl-Q keep the terminal's own
+        # flow control, and on macOS the delayed suspend character is disabled,
+        # for it would wake the reader up with nothing to read
+        tty.setcbreak(self._fd, termios.TCSANOW)
+        if sys.platform == "darwin":
+            attrs = termios.tcgetattr(self._fd)
+            attrs[tty.CC][termios.VSUSP + 1] = 0  # VDSUSP
+            termios.tcsetattr(self._fd, termios.TCSANOW, attrs)
+        self._loop.add_reader(self._fd, self._on_readable)
+        self._prev_sig_handler = signal.getsignal(signal.SIGINT)
+        self._loop.add_signal_handler(signal.SIGINT, self._emit, SigIntEvent())
         return self
 
     def __exit__(
@@ -71,10 +150,11 @@ class InputScope(AbstractContextManager["InputScope"]):
         if not self._subject.is_disposed:
             self._subject.dispose()
 
-        if self._thread.ident and self._thread.is_alive():
-            self._sig_handler()
-            self._thread.join()
-
-        signal.signal(signal.SIGINT, self._prev_sig_handler)
-
-        return self._input.__exit__(exc_type, exc_value, traceback)
+        if self._timeout:
+            self._timeout.cancel()
+        if self._loop:
+            self._loop.remove_reader(self._fd)
+            self._loop.remove_signal_handler(signal.SIGINT)
+            signal.signal(signal.SIGINT, self._prev_sig_handler)
+        if self._orig_attrs is not None:
+            termios.tcsetattr(self._fd, termios.TCSANOW, self._orig_attrs)
@@ -13,3 +13,5 @@ UP = KeyEvent("<UP>")
 DOWN = KeyEvent("<DOWN>")
 PAGEUP = KeyEvent("<PAGEUP>")
 PAGEDOWN = KeyEvent("<PAGEDOWN>")
+HOME = KeyEvent("<HOME>")
+END = KeyEvent("<END>")
@@ -0,0 +1,248 @@
+"""
+Compiled XDXF: a versioned token stream replayed by ``XmlNodeVisitor``.
+
+A stream is stored as text delimited by control characters, which XML does not
+allow in documents, so the text runs are stored as they are:
+
+* the version and the interned tag names, each part ended by ``END`` and the
+  names separated by ``FIELD``;
+* a text run, as is;
+* ``OPEN`` and the tag id, an opening tag without attributes;
+* ``OPEN_ATTRS``, the tag id, the keys and values separated by ``FIELD``, and
+  ``END``, an opening tag with attributes;
+* ``CLOSE``, the end of the innermost open tag.
+
+A tag id is a single character, ``ID_BASE`` plus the index of the name. The
+control characters that still occur in a string are escaped by ``ESCAPE``.
+"""
+
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Final
+
+# 2: tokenized with HTMLParser, comments dropped
+# 3: delimited by control characters instead of JSON
+VERSION: Final = 3
+
+OPEN: Final = "\x01"
+OPEN_ATTRS: Final = "\x02"
+CLOSE: Final = "\x03"
+FIELD: Final = "\x04"
+END: Final = "\x05"
+ESCAPE: Final = "\x06"
+ID_BASE: Final = 0x20
+# ids stop short of the surrogates, which cannot be encoded
+MAX_TAGS: Final = 0xD800 - ID_BASE
+
+_SPECIAL: Final = re.compile("[\x01-\x06]")
+_ESCAPED: Final = re.compile("\x06([A-F])")
+_MARKERS: Final = re.compile("([\x01-\x03])")
+
+# elements without content, closed as soon as they are opened
+VOID_TAGS: Final = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+_ASCII_SPACES: Final = " \n\t\f\r"
+
+type Op = str | int | list[Any] | None
+
+
+@dataclass(slots=True, frozen=True)
+class TokenStream:
+    tags: list[str]
+    ops: list[Op]
+    # index of the matching end for each opening tag, -1 for other ops
+    ends: list[int]
+
+    def open_tag(self, idx: int) -> tuple[str, Mapping[str, str]]:
+        match self.ops[idx]:
+            case int() as tag:
+                return self.tags[tag], {}
+            case [int() as tag, dict() as attrs]:
+                return self.tags[tag], attrs
+        raise ValueError(f"No opening tag at {idx}")
+
+
+class _Tokenizer(HTMLParser):
+    """
+    Event-based markup reader emitting tokens without building a tree.
+
+    Malformed markup is recovered the way the tree builders do it: an end tag
+    closes every tag opened after its match, stray end tags are dropped, and
+    tags left open are closed at the end of the input. Text between two tags
+    made of whitespace only is collapsed to a single newline or space.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.tags = list[str]()
+        self.tag_ids = dict[str, int]()
+        self.ops = list[Op]()
+        self.ends = list[int]()
+        self.opened = list[tuple[str, int]]()
+        self.data = list[str]()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._flush()
+        name = tag.rpartition(":")[2]
+        tag_id = self.tag_ids.get(name)
+        if tag_id is None:
+            tag_id = self.tag_ids[name] = len(self.tags)
+            self.tags.append(name)
+        attrs_map = {k.rpartition(":")[2]: v or "" for k, v in attrs}
+
+        self.opened.append((tag, len(self.ops)))
+        self._append([tag_id, attrs_map] if attrs_map else tag_id)
+        if name in VOID_TAGS:
+            self._close()
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag.rpartition(":")[2] not in VOID_TAGS:
+            self._close()
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush()
+        if not any(name == tag for name, _ in self.opened):
+            return
+        while self._close() != tag:
+            pass
+
+    def handle_data(self, data: str) -> None:
+        self.data.append(data)
+
+    def unknown_decl(self, data: str) -> None:
+        if data.startswith("CDATA["):
+            self._flush()
+            self.data.append(data[6:])
+            self._flush()
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+        while self.opened:
+            self._close()
+
+    def _flush(self) -> None:
+        if not self.data:
+            return
+        text = "".join(self.data)
+        self.data.clear()
+        if not text.strip(_ASCII_SPACES):
+            text = "\n" if "\n" in text else " "
+        if self.ops and isinstance(self.ops[-1], str):
+            self.ops[-1] += text
+        else:
+            self._append(text)
+
+    def _append(self, op: Op) -> None:
+        self.ops.append(op)
+        self.ends.append(-1)
+
+    def _close(self) -> str:
+        tag, start = self.opened.pop()
+        self.ends[start] = len(self.ops)
+        self._append(None)
+        return tag
+
+
+def compile_xdxf(xml: str) -> TokenStream:
+    tokenizer = _Tokenizer()
+    tokenizer.feed(xml)
+    tokenizer.close()
+    return TokenStream(tokenizer.tags, tokenizer.ops, tokenizer.ends)
+
+
+def _escape(text: str) -> str:
+    return _SPECIAL.sub(lambda m: ESCAPE + chr(ord(m[0]) + 0x40), text)
+
+
+def _unescape(text: str) -> str:
+    if ESCAPE not in text:
+        return text
+    return _ESCAPED.sub(lambda m: chr(ord(m[1]) - 0x40), text)
+
+
+def dumps(stream: TokenStream) -> str:
+    if len(stream.tags) > MAX_TAGS:
+        raise ValueError(f"{len(stream.tags)} tags do not fit the tag ids")
+
+    tags = FIELD.join(_escape(tag) for tag in stream.tags)
+    parts = [str(VERSION), END, tags, END]
+    for op in stream.ops:
+        match op:
+            case str():
+                parts.append(_escape(op))
+            case int():
+                parts += OPEN, chr(ID_BASE + op)
+            case [int() as tag, dict() as attrs]:
+                fields = FIELD.join(_escape(f) for item in attrs.items() for f in item)
+                parts += OPEN_ATTRS, chr(ID_BASE + tag), fields, END
+            case None:
+                parts.append(CLOSE)
+    return "".join(parts)
+
+
+def loads(data: str) -> TokenStream | None:
+    """Decode a stored stream, or return None if it is stale or malformed."""
+
+    version, _, rest = data.partition(END)
+    tags_part, sep, body = rest.partition(END)
+    if version != str(VERSION) or not sep:
+        return None
+
+    tags = [_unescape(tag) for tag in tags_part.split(FIELD)] if tags_part else []
+    ops, opened, spans = list[Op](), list[int](), list[tuple[int, int]]()
+    append = ops.append
+    # text runs alternate with the markers, each marker followed by its fields
+    pieces = _MARKERS.split(body)
+    if pieces[0]:
+        append(_unescape(pieces[0]))
+    for idx in range(1, len(pieces), 2):
+        marker, text = pieces[idx], pieces[idx + 1]
+        if marker == CLOSE:
+            if not opened:
+                return None
+            spans.append((opened.pop(), len(ops)))
+            append(None)
+        else:
+            tag = ord(text[0]) - ID_BASE if text else -1
+            if not 0 <= tag < len(tags):
+                return None
+            opened.append(len(ops))
+            if marker == OPEN:
+                text = text[1:]
+                append(tag)
+            else:
+                attrs, sep, text = text[1:].partition(END)
+                fields = [_unescape(f) for f in attrs.split(FIELD)] if attrs else []
+                if not sep or len(fields) % 2:
+                    return None
+                append([tag, dict(zip(fields[::2], fields[1::2]))])
+        if text:
+            append(_unescape(text) if ESCAPE in text else text)
+    if opened:
+        return None
+
+    ends = [-1] * len(ops)
+    for start, end in spans:
+        ends[start] = end
+    return TokenStream(tags, ops, ends)
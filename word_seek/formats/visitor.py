@@ -1,47 +1,50 @@
-from collections.abc import Mapping
 from collections import deque
+from collections.abc import Mapping
 
-from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
-from bs4.element import NavigableString, Tag
-
-import warnings
-
-warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+from .tokens import TokenStream, compile_xdxf, loads
 
 
 class XmlNodeVisitor:
     def __init__(self) -> None:
-        self._nstack = deque[Tag]()
+        self._stream = TokenStream([], [], [])
+        self._ranges = deque[tuple[int, int]]()
+
+    def visit(self, xml: str, tokens: str | None = None) -> None:
+        """Visit the markup, replaying its compiled tokens when they are current."""
+
+        stream = loads(tokens) if tokens else None
+        self.visit_tokens(stream or compile_xdxf(xml))
 
-    def visit(self, xml: str) -> None:
-        doc = BeautifulSoup(xml, "html.parser")
-        self._nstack.clear()
-        self._nstack.append(doc)
+    def visit_tokens(self, stream: TokenStream) -> None:
+        self._stream = stream
+        self._ranges.clear()
+        self._ranges.append((0, len(stream.ops)))
         self.visit_children()
-        self._nstack.clear()
+        self._ranges.clear()
 
     def visit_tag(self, tag: str, attrs: Mapping[str, str]) -> None:
         self.visit_children()
 
     def visit_children(self) -> None:
-        if not self._nstack:
+        if not self._ranges:
             return
-        for node in self._nstack[-1].children:
-            match node:
-                case str() | NavigableString():
-                    self.visit_text(node)
-                case Tag():
-                    attrs = {
-                        k.split(":")[-1]: " ".join([v] if isinstance(v, str) else v)
-                        for k, v in node.attrs.items()
-                    }
-                    name = node.name.split(":")[-1]
-
-                    self._nstack.append(node)
-                    try:
-                        self.visit_tag(name, attrs)
-                    finally:
-                        self._nstack.pop()
+        stream = self._stream
+        idx, end = self._ranges[-1]
+        while idx < end:
+            op = stream.ops[idx]
+            if isinstance(op, str):
+                self.visit_text(op)
+                idx += 1
+                continue
+
+            tag_end = stream.ends[idx]
+            name, attrs = stream.open_tag(idx)
+            self._ranges.append((idx + 1, tag_end))
+            try:
+                self.visit_tag(name, attrs)
+            finally:
+                self._ranges.pop()
+            idx = tag_end + 1
 
     def visit_text(self, text: str) -> None:
         pass
@@ -1,3 +1,4 @@
+import logging
 from dataclasses import dataclass
 from enum import StrEnum
 from os import PathLike
@@ -13,9 +14,13 @@ from .db import repo
 from .db.exec import new_session
 from .db.imports import import_dictionary
 from .db.models import ArticleImportItem, Dictionary, ArticleFormat
+from .formats import tokens
+from .index import headwords
 from .utils.collections import aio_count
 from .utils.files import checksum_file
 
+logger = logging.getLogger()
+
 
 class ProgressCategory(StrEnum):
     OK = "ok"
@@ -40,11 +45,16 @@ async def bulk_import(dir_path: str | PathLike[str]) -> AsyncIterable[ImportProg
         stardicts.filter_path_in(path)
 
     stard_items = list(stardicts)
+    imported = False
     for stard_num, stard_item in enumerate(stard_items, 1):
         name, cnt, bad_formats = await _import_item(stard_item)
+        imported = imported or bool(cnt)
         ctg, msg = _map_progess_category(cnt, bad_formats)
         yield ImportProgress(ctg, name, len(stard_items), stard_num, msg)
 
+    if imported:
+        await headwords.rebuild()
+
 
 def _map_progess_category(
     cnt: int | None, bad_formats: set[str]
@@ -80,11 +90,24 @@ async def _map_dict_entries(
                 case _:
                     error_formats.add(entry.dtype.value)
                     continue
+            text = entry.data.decode()
             yield ArticleImportItem(
-                phrase=ientry.word, index=idx, format=format, text=entry.data.decode()
+                phrase=ientry.word,
+                index=idx,
+                format=format,
+                text=text,
+                tokens=_compile_tokens(text) if format == ArticleFormat.XDXF else None,
             )
 
 
+def _compile_tokens(text: str) -> str | None:
+    try:
+        return tokens.dumps(tokens.compile_xdxf(text))
+    except Exception as exc:
+        logger.warning("XDXF compile error: %s", exc)
+        return None
+
+
 async def _import_item(item: StarDictFiles) -> tuple[str, int | None, set[str]]:
     error_formats = set[str]()
     checksum = await checksum_file(item.dict)
@@ -0,0 +1,112 @@
+"""
+Annotation of a whole text against the dictionaries.
+
+The text is split into word tokens, and each distinct token is looked up once:
+first as it is written, then normalized for the tokens that missed, each pass a
+few set-based queries of many terms rather than a query per word.
+"""
+
+import asyncio
+import re
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Final
+
+from ..db import repo
+from ..db.exec import READ_POOL_SIZE
+from ..db.models import PhraseRow, TermMatch
+from . import fuzzy
+
+# letters and digits, with inner apostrophes and hyphens: "don't", "well-known"
+TOKEN: Final = re.compile(r"\w+(?:['’-]\w+)*")
+
+# terms per query, and the queries run at once: one per reader
+BATCH_SIZE: Final = 1000
+BATCH_CONCURRENCY: Final = READ_POOL_SIZE
+
+
+class MatchKind(StrEnum):
+    EXACT = "exact"
+    NORMALIZED = "normalized"
+
+
+@dataclass(slots=True)
+class TokenHit:
+    token: str
+    count: int
+    # None when the token has no phrase
+    kind: MatchKind | None = None
+    phrase: PhraseRow | None = None
+    dictionary_ids: list[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Coverage:
+    # None for all the dictionaries together
+    dictionary_id: int | None
+    title: str
+    tokens: int = 0
+    distinct: int = 0
+
+
+@dataclass(slots=True)
+class Annotation:
+    tokens: int
+    # a hit per distinct token, in the order of their first appearance
+    hits: list[TokenHit]
+    # all the dictionaries first, then each one in the sort order
+    coverage: list[Coverage]
+
+
+def tokenize(text: str) -> Iterator[str]:
+    for match in TOKEN.finditer(text):
+        yield match.group()
+
+
+async def match_all(terms: list[str]) -> list[TermMatch]:
+    slots = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def match(chunk: list[str]) -> list[TermMatch]:
+        async with slots:
+            return await repo.match_terms(chunk)
+
+    chunks = [terms[i : i + BATCH_SIZE] for i in range(0, len(terms), BATCH_SIZE)]
+    results = await asyncio.gather(*(match(chunk) for chunk in chunks))
+    return [found for result in results for found in result]
+
+
+async def annotate(text: str) -> Annotation:
+    counts = Counter(tokenize(text))
+    hits = [TokenHit(token, count) for token, count in counts.items()]
+
+    matches = dict(zip(counts, await match_all(list(counts))))
+
+    # "The" and "THE" both fall back to "the", which is looked up only if it is
+    # not a token of the text itself
+    normalized = {token: fuzzy.normalize(token) for token in counts}
+    missed = dict.fromkeys(
+        term
+        for token, term in normalized.items()
+        if matches[token].phrase is None and term not in matches
+    )
+    matches.update(zip(missed, await match_all(list(missed))))
+
+    for hit in hits:
+        if (found := matches[hit.token]).phrase:
+            hit.kind = MatchKind.EXACT
+        elif (found := matches[normalized[hit.token]]).phrase:
+            hit.kind = MatchKind.NORMALIZED
+        hit.phrase, hit.dictionary_ids = found.phrase, found.dictionary_ids
+
+    total = Coverage(None, "all")
+    coverage = {d.id: Coverage(d.id, d.title) for d in await repo.list_dicts()}
+    for hit in hits:
+        if hit.phrase is None:
+            continue
+        covered = [coverage[id] for id in hit.dictionary_ids if id in coverage]
+        for item in [total, *covered]:
+            item.tokens += hit.count
+            item.distinct += 1
+    return Annotation(counts.total(), hits, [total, *coverage.values()])
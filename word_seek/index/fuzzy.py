@@ -0,0 +1,59 @@
+"""
+Deletion neighbourhoods for typo-tolerant lookups (the SymSpell approach).
+
+A headword is indexed by the hashes of every string obtained by deleting up to
+``MAX_DISTANCE`` characters from its first ``PREFIX_LENGTH`` characters. A term
+shares at least one such key with each headword within the edit distance, so
+candidates are fetched by key and verified with ``edit_distance``.
+"""
+
+import zlib
+from typing import Final
+
+MAX_DISTANCE: Final = 2
+PREFIX_LENGTH: Final = 7
+
+
+def normalize(text: str) -> str:
+    return text.strip().casefold()
+
+
+def max_distance_for(term: str) -> int:
+    return max(1, min(MAX_DISTANCE, len(term) // 3))
+
+
+def deletes(word: str, distance: int = MAX_DISTANCE) -> set[str]:
+    result = {word}
+    edge = {word}
+    for _ in range(distance):
+        edge = {w[:i] + w[i + 1 :] for w in edge for i in range(len(w))} - result
+        result |= edge
+    return result
+
+
+def deletion_keys(text: str, distance: int = MAX_DISTANCE) -> set[int]:
+    prefix = normalize(text)[:PREFIX_LENGTH]
+    return {zlib.crc32(item.encode()) for item in deletes(prefix, distance)}
+
+
+def edit_distance(s1: str, s2: str, max_distance: int = MAX_DISTANCE) -> int:
+    """Optimal string alignment distance, or ``max_distance + 1`` if farther."""
+
+    if abs(len(s1) - len(s2)) > max_distance:
+        return max_distance + 1
+    if s1 == s2:
+        return 0
+
+    prev2: list[int] = []
+    prev = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1, 1):
+        cur = [i] + [0] * len(s2)
+        for j, c2 in enumerate(s2, 1):
+            cost = 0 if c1 == c2 else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and c1 == s2[j - 2] and s1[i - 2] == c2:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    return min(prev[-1], max_distance + 1)
@@ -0,0 +1,59 @@
+import asyncio
+import os
+from functools import partial
+
+from anyio import to_thread
+
+from ..db import repo
+from ..db.config import get_headwords_path
+from .snapshot import HeadwordSnapshot, write_snapshot
+
+type _FileId = tuple[int, int]
+
+_lock = asyncio.Lock()
+_snapshot: HeadwordSnapshot | None = None
+_file_id: _FileId | None = None
+
+
+def _stat_file_id() -> _FileId | None:
+    try:
+        stat = os.stat(get_headwords_path())
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+async def load() -> HeadwordSnapshot | None:
+    global _snapshot, _file_id
+
+    async with _lock:
+        file_id = _stat_file_id()
+        if file_id == _file_id:
+            return _snapshot
+
+        invalidate()
+        snapshot = HeadwordSnapshot.open(get_headwords_path()) if file_id else None
+        if snapshot and snapshot.stamp != await repo.headwords_stamp():
+            # the phrases changed since it was written, so it is written again
+            snapshot.close()
+            await rebuild()
+            file_id = _stat_file_id()
+            snapshot = HeadwordSnapshot.open(get_headwords_path())
+        _snapshot, _file_id = snapshot, file_id
+        return _snapshot
+
+
+def invalidate() -> None:
+    global _snapshot, _file_id
+
+    if _snapshot:
+        _snapshot.close()
+    _snapshot, _file_id = None, None
+
+
+async def rebuild() -> None:
+    stamp = await repo.headwords_stamp()
+    headwords = await repo.list_phrase_texts()
+    await to_thread.run_sync(
+        partial(write_snapshot, get_headwords_path(), headwords, stamp)
+    )
@@ -0,0 +1,119 @@
+"""
+On-disk headword snapshot: a header, an offsets array and a sorted UTF-8 blob.
+
+Headwords are sorted by their UTF-8 bytes, which is the order SQLite uses for
+the phrase text, so a prefix lookup is a binary search over the mapped file.
+"""
+
+import mmap
+import os
+import zlib
+from collections.abc import Iterable
+from os import PathLike
+from struct import Struct
+from typing import Final, Self
+
+MAGIC: Final = b"WSHEADWD"
+VERSION: Final = 1
+
+# magic, version, reserved, headword count, stamp, blob size, crc32 of payload
+_HEADER: Final = Struct("<8sHHI20sQI4x")
+_OFFSET: Final = Struct("<Q")
+
+
+class HeadwordSnapshot:
+    def __init__(self, mem: mmap.mmap, count: int, stamp: bytes) -> None:
+        self._mem = mem
+        self.count = count
+        self.stamp = stamp
+        self._blob_start = _HEADER.size + (count + 1) * _OFFSET.size
+
+    @classmethod
+    def open(cls, path: str | PathLike[str]) -> Self | None:
+        try:
+            with open(path, "rb") as file:
+                mem = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        if len(mem) < _HEADER.size:
+            mem.close()
+            return None
+        magic, version, _, count, stamp, blob_size, crc = _HEADER.unpack_from(mem)
+        payload_size = (count + 1) * _OFFSET.size + blob_size
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or len(mem) != _HEADER.size + payload_size
+            or _crc32(mem, _HEADER.size) != crc
+        ):
+            mem.close()
+            return None
+        return cls(mem, count, stamp)
+
+    def close(self) -> None:
+        self._mem.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _entry(self, idx: int) -> bytes:
+        start, end = self._offset(idx), self._offset(idx + 1)
+        return self._mem[self._blob_start + start : self._blob_start + end]
+
+    def _offset(self, idx: int) -> int:
+        (offset,) = _OFFSET.unpack_from(self._mem, _HEADER.size + idx * _OFFSET.size)
+        return offset
+
+    def bisect(self, key: bytes, right: bool = False) -> int:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._entry(mid)
+            if entry < key or (right and entry == key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def prefixed(self, prefix: str, limit: int, after: str | None = None) -> list[str]:
+        key = prefix.encode()
+        result = list[str]()
+        idx = self.bisect(key)
+        if after is not None:
+            idx = max(idx, self.bisect(after.encode(), right=True))
+        while idx < self.count and len(result) < limit:
+            entry = self._entry(idx)
+            if not entry.startswith(key):
+                break
+            result.append(str(entry, "utf-8"))
+            idx += 1
+        return result
+
+
+def _crc32(mem: mmap.mmap, start: int) -> int:
+    with memoryview(mem) as view, view[start:] as payload:
+        return zlib.crc32(payload)
+
+
+def write_snapshot(
+    path: str | PathLike[str], headwords: Iterable[str], stamp: bytes
+) -> None:
+    encoded = sorted({word.encode() for word in headwords})
+    offsets = bytearray(_OFFSET.size * (len(encoded) + 1))
+    position = 0
+    for idx, word in enumerate(encoded):
+        _OFFSET.pack_into(offsets, idx * _OFFSET.size, position)
+        position += len(word)
+    _OFFSET.pack_into(offsets, len(encoded) * _OFFSET.size, position)
+    blob = b"".join(encoded)
+
+    crc = zlib.crc32(blob, zlib.crc32(offsets))
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(encoded), stamp, len(blob), crc)
+
+    tmp_path = f"{os.fspath(path)}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(header)
+        file.write(offsets)
+        file.write(blob)
+    os.replace(tmp_path, path)
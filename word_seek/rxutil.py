@@ -1,13 +1,16 @@
 import asyncio
+import concurrent.futures
 import weakref
-from collections.abc import AsyncIterable, Awaitable, Callable, Coroutine
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from reactivex import Observable
-from reactivex.abc import DisposableBase, ObservableBase
-from reactivex.scheduler import ThreadPoolScheduler
+from reactivex.abc import DisposableBase, ObservableBase, ObserverBase, SchedulerBase
 from reactivex.scheduler.eventloop import AsyncIOThreadSafeScheduler
-from reactivex.subject import AsyncSubject
+
+_schedulers = weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, AsyncIOThreadSafeScheduler
+]()
 
 
 class NullDisposable(DisposableBase):
@@ -23,11 +26,15 @@ class FlagDisposable(DisposableBase):
 
 
 class TaskDisposable(DisposableBase):
-    def __init__(self, task: asyncio.Task) -> None:
+    def __init__(self, task: asyncio.Future | concurrent.futures.Future) -> None:
         self.task = task
 
     def dispose(self) -> None:
-        self.task.cancel()
+        match self.task:
+            case asyncio.Future():
+                call_on_loop(self.task.get_loop(), self.task.cancel)
+            case _:
+                self.task.cancel()
 
 
 class CallbackDisposable(DisposableBase):
@@ -42,106 +49,80 @@ class CallbackDisposable(DisposableBase):
             self._callback()
 
 
-async def till_complete_async[T](observable: ObservableBase[T]) -> None:
-    future = asyncio.Future[None]()
-    loop = asyncio.get_running_loop()
+def loop_scheduler(
+    loop: asyncio.AbstractEventLoop | None = None,
+) -> AsyncIOThreadSafeScheduler:
+    """The scheduler of the loop, shared by every pipeline running on it."""
 
-    def set_result() -> None:
-        loop.call_soon_threadsafe(future.set_result, None)
+    loop = loop or asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _schedulers[loop] = AsyncIOThreadSafeScheduler(loop)
+    return scheduler
 
-    with observable.subscribe(
-        on_completed=set_result,
-        scheduler=AsyncIOThreadSafeScheduler(loop),
-    ):
-        await future
 
+def is_on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
 
-async def next_async[T](observable: ObservableBase[T]) -> T | None:
-    future = asyncio.Future[T]()
-    loop = asyncio.get_running_loop()
 
-    def set_result(item: T) -> None:
-        if not future.done():
-            future.set_result(item)
+def call_on_loop(
+    loop: asyncio.AbstractEventLoop, func: Callable[..., object], *args: Any
+) -> None:
+    """Call now when already on the loop, otherwise hand the call over to it."""
 
-    def set_error(error: Exception) -> None:
-        if not future.done():
-            future.set_exception(error)
+    if is_on_loop(loop):
+        func(*args)
+    else:
+        loop.call_soon_threadsafe(func, *args)
 
-    def call_threadsafe[R](func: Callable[[R], None], arg: R) -> None:
-        loop.call_soon_threadsafe(func, arg)
-
-    with observable.subscribe(
-        on_next=lambda item: call_threadsafe(set_result, item),
-        on_error=lambda err: call_threadsafe(set_error, err),
-        on_completed=lambda: call_threadsafe(set_error, StopAsyncIteration()),
-        scheduler=ThreadPoolScheduler(),
-    ):
-        try:
-            return await future
-        except StopAsyncIteration:
-            return None
-
-
-async def iterate_async[T](observable: Observable[T]) -> AsyncIterable[T]:
-    complete = False
-    next_event = asyncio.Event()
-    next_items = list[T]()
-    err: Exception | None = None
 
+async def till_complete_async[T](observable: ObservableBase[T]) -> None:
     loop = asyncio.get_running_loop()
+    future = loop.create_future()
 
-    def on_completed() -> None:
-        nonlocal complete
-        complete = True
-        loop.call_soon_threadsafe(next_event.set)
-
-    def on_next(item: T) -> None:
-        print("next")
-        next_items.append(item)
-        loop.call_soon_threadsafe(next_event.set)
+    def set_result() -> None:
+        if not future.done():
+            future.set_result(None)
 
-    def on_error(error: Exception) -> None:
-        nonlocal err
-        err = error
-        loop.call_soon_threadsafe(next_event.set)
+    def set_error(error: Exception) -> None:
+        if not future.done():
+            future.set_exception(error)
 
     with observable.subscribe(
-        on_next=on_next,
-        on_error=on_error,
-        on_completed=on_completed,
-        scheduler=AsyncIOThreadSafeScheduler(loop),
+        on_error=lambda error: call_on_loop(loop, set_error, error),
+        on_completed=lambda: call_on_loop(loop, set_result),
+        scheduler=loop_scheduler(loop),
     ):
-        while not complete:
-            await next_event.wait()
-
-            for item in next_items:
-                yield item
-            next_items.clear()
-            if err:
-                raise err
+        await future
 
 
 def async_observable[T](
-    awaitable: Awaitable[T] | Coroutine[Any, Any, T],
+    factory: Callable[[], Awaitable[T]],
     loop: asyncio.AbstractEventLoop,
 ) -> Observable[T]:
-    subject = AsyncSubject[T]()
-    task_refs = weakref.WeakKeyDictionary[object, asyncio.Task]()
+    """
+    Create the awaitable and run it on the loop once subscribed; disposing
+    cancels it. Disposed before its task starts, it is never created, so no
+    coroutine is left unawaited.
+    """
 
-    async def run() -> None:
+    async def run(observer: ObserverBase[T]) -> None:
         try:
-            res = await awaitable
-            subject.on_next(res)
+            res = await factory()
         except Exception as exc:
-            subject.on_error(exc)
-            raise
-        finally:
-            subject.on_completed()
-
-    def start_task() -> None:
-        task = loop.create_task(run())
-        task_refs[subject] = task
-
-    loop.call_soon_threadsafe(start_task)
-    return subject
+            observer.on_error(exc)
+            return
+        observer.on_next(res)
+        observer.on_completed()
+
+    def subscribe(
+        observer: ObserverBase[T], scheduler: SchedulerBase | None = None
+    ) -> DisposableBase:
+        if is_on_loop(loop):
+            return TaskDisposable(loop.create_task(run(observer)))
+        return TaskDisposable(asyncio.run_coroutine_threadsafe(run(observer), loop))
+
+    return Observable(subscribe)
@@ -0,0 +1,113 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    entries: int
+    size: int
+    max_size: int
+
+
+class LRUCache[K: Hashable, V]:
+    """
+    Least recently used cache bounded by the total size of its values.
+
+    Entries belong to a generation: looking up with a different generation drops
+    everything cached so far. With a ``ttl``, entries older than that many
+    seconds of the ``clock`` are not returned.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        sizeof: Callable[[V], int],
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._clock = clock
+        self._items = OrderedDict[K, tuple[V, int, float]]()
+        self._size = 0
+        self._generation: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int | None:
+        return self._generation
+
+    def get(self, key: K, generation: int) -> V | None:
+        value = self.peek(key, generation)
+        if value is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: K, generation: int) -> V | None:
+        """Look up without counting it or refreshing the entry."""
+
+        self._sync(generation)
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if self._is_expired(item[2]):
+            self.discard(key)
+            return None
+        return item[0]
+
+    def put(
+        self, key: K, value: V, generation: int, stored_at: float | None = None
+    ) -> None:
+        self._sync(generation)
+        self.discard(key)
+        size = self._sizeof(value)
+        if size > self.max_size:
+            return
+        if stored_at is None:
+            stored_at = self._clock()
+        self._items[key] = value, size, stored_at
+        self._size += size
+        while self._size > self.max_size:
+            _, (_, evicted, _) = self._items.popitem(last=False)
+            self._size -= evicted
+
+    def discard(self, key: K) -> None:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._size -= item[1]
+
+    def entries(self) -> list[tuple[K, V, float]]:
+        """Live entries with the time they were stored, least recent first."""
+
+        return [
+            (key, value, stored_at)
+            for key, (value, _, stored_at) in self._items.items()
+            if not self._is_expired(stored_at)
+        ]
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._size = 0
+        self._generation = None
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self.hits, self.misses, len(self._items), self._size, self.max_size
+        )
+
+    def _sync(self, generation: int) -> None:
+        if generation != self._generation:
+            self.clear()
+            self._generation = generation
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and self._clock() - stored_at > self.ttl